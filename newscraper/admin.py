@@ -8,9 +8,10 @@ class ArticleAdmin(admin.ModelAdmin):
     list_filter = ('source', 'category', 'scraped_at')
     search_fields = ('title', 'content')
     readonly_fields = ('scraped_at',)
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related()
+    date_hierarchy = 'scraped_at'
+    list_select_related = False
+    list_per_page = 50
+    show_full_result_count = False
 
 
 @admin.register(UserProfile)
@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL_HOURS = 24
+# Keep IN (...) lookups under SQLite's host parameter limit
+LOOKUP_CHUNK_SIZE = 500
+# Digits and markup vary between mirrors of the same story (timestamps, share counts)
+DIGEST_NOISE_RE = re.compile(r'\d+|<[^>]+>')
+
+
+class ArticleCache:
+    """URL-keyed store of article bodies so repeated runs skip unchanged articles"""
+
+    def __init__(self, ttl_hours=DEFAULT_CACHE_TTL_HOURS, cache_file=None):
+        self.ttl_seconds = int(ttl_hours * 3600)
+        self.cache_file = cache_file or os.getenv(
+            'ARTICLE_CACHE_FILE', str(settings.BASE_DIR / 'article_cache.sqlite3')
+        )
+        self.conn = sqlite3.connect(self.cache_file)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache (url TEXT PRIMARY KEY, content TEXT, fetched_at INTEGER)'
+        )
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS http_cache (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB)'
+        )
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS content_digests (digest INTEGER PRIMARY KEY, url TEXT)'
+        )
+
+    def get_many(self, urls):
+        """Return {url: content} for URLs cached within the TTL"""
+        urls = list(urls)
+        # A TTL of 0 forces a refetch; fresh results are still written back
+        if self.ttl_seconds <= 0 or not urls:
+            return {}
+
+        cutoff = int(time.time()) - self.ttl_seconds
+        hits = {}
+        try:
+            for start in range(0, len(urls), LOOKUP_CHUNK_SIZE):
+                chunk = urls[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f'SELECT url, content FROM cache WHERE fetched_at > ? AND url IN ({placeholders})',
+                    [cutoff, *chunk]
+                )
+                hits.update(rows)
+        except sqlite3.Error as e:
+            logger.error(f"Error reading article cache: {e}")
+        return hits
+
+    def put_many(self, items):
+        """Store (url, content) pairs, skipping empty bodies, and commit pending writes"""
+        now = int(time.time())
+        rows = [(url, content, now) for url, content in items if content]
+        try:
+            # One commit per page also covers the digests and validators recorded since the last one
+            with self.conn:
+                self.conn.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?, ?)', rows)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing article cache: {e}")
+
+    def get_stale(self, url):
+        """Return the last cached content for a URL regardless of TTL"""
+        row = self.conn.execute('SELECT content FROM cache WHERE url = ?', (url,)).fetchone()
+        return row[0] if row else ""
+
+    def get_validators(self, url):
+        """Return (conditional GET headers, stored body or None) for a URL"""
+        # Only revalidate when a 304 has something to fall back on: the stored
+        # page body, or previously cached article content
+        row = self.conn.execute(
+            'SELECT etag, last_modified, body FROM http_cache WHERE url = ? '
+            'AND (body IS NOT NULL OR EXISTS (SELECT 1 FROM cache WHERE cache.url = http_cache.url))',
+            (url,)
+        ).fetchone()
+        if not row:
+            return {}, None
+
+        etag, last_modified, body = row
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers, body
+
+    def put_validators(self, url, response, keep_body=False):
+        """Remember a response's ETag/Last-Modified (and optionally its body)"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        # Committed with the next put_many() or on close()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?)',
+            (url, etag, last_modified, response.content if keep_body else None)
+        )
+
+    @staticmethod
+    def content_digest(content):
+        """Return a 63-bit fingerprint of normalised article text"""
+        normalized = ' '.join(DIGEST_NOISE_RE.sub('', content.lower()).split())
+        digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+        # Fits SQLite's signed INTEGER, so the digest can be the rowid
+        return int.from_bytes(digest, 'big') >> 1
+
+    def claim_content(self, items):
+        """Record digests for (url, content) pairs; return URLs whose content is already stored under another URL"""
+        digests = {url: self.content_digest(content) for url, content in items if content}
+        if not digests:
+            return set()
+
+        owners = {}
+        values = list(set(digests.values()))
+        try:
+            for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+                chunk = values[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                owners.update(self.conn.execute(
+                    f'SELECT digest, url FROM content_digests WHERE digest IN ({placeholders})', chunk
+                ))
+        except sqlite3.Error as e:
+            logger.error(f"Error reading content digests: {e}")
+            return set()
+
+        duplicates = set()
+        new_rows = []
+        for url, digest in digests.items():
+            owner = owners.get(digest)
+            if owner is None:
+                owners[digest] = url
+                new_rows.append((digest, url))
+            elif owner != url:
+                duplicates.add(url)
+
+        try:
+            # Committed with the next put_many() or on close()
+            self.conn.executemany('INSERT OR IGNORE INTO content_digests VALUES (?, ?)', new_rows)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing content digests: {e}")
+        return duplicates
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
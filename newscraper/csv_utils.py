@@ -0,0 +1,166 @@
+import csv
+import mmap
+import os
+import re
+
+# Column order of the per-source news CSVs
+NEWS_FIELDS = ['title', 'url', 'date', 'content', 'source', 'scraped_at']
+CSV_BUFFER_SIZE = 1 << 20
+
+# One CSV field: quoted (may hold commas, quotes and newlines) or bare
+_CSV_FIELD = rb'(?:"[^"]*(?:""[^"]*)*"|[^",\r\n]*)'
+_CSV_RECORD = re.compile(rb'%s(?:,%s)*(?:\r?\n|\Z)' % (_CSV_FIELD, _CSV_FIELD))
+
+
+def read_csv_header(file_path):
+    """Return the header row of a CSV, or None if the file is missing or empty"""
+    try:
+        with open(file_path, newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+
+
+def row_fieldnames(rows):
+    """Union of the rows' keys in first-seen order"""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+
+def write_csv_stream(stream, rows, fieldnames):
+    """Write a header and dict rows to an open text stream and return the row count"""
+    writer = csv.DictWriter(stream, fieldnames=fieldnames, extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rows)
+    return len(rows)
+
+
+def write_csv_rows(file_path, rows, fieldnames):
+    """Write dict rows to a new CSV and return the row count"""
+    with open(file_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        return write_csv_stream(f, rows, fieldnames)
+
+
+def append_csv_rows(file_path, rows, fieldnames=NEWS_FIELDS):
+    """Append dict rows to a CSV, writing the header only when the file is new"""
+    header = read_csv_header(file_path)
+    if not header:
+        return write_csv_rows(file_path, rows, fieldnames)
+
+    # Keep appended rows aligned with the existing header
+    with open(file_path, 'a', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.DictWriter(f, fieldnames=header, extrasaction='ignore', lineterminator='\n')
+        writer.writerows(rows)
+    return len(rows)
+
+
+def _column_pattern(index):
+    """A whole record, capturing the field at index"""
+    return re.compile(rb'(?:%s,){%d}(%s)(?:,%s)*(?:\r?\n|\Z)' % (_CSV_FIELD, index, _CSV_FIELD, _CSV_FIELD))
+
+
+def _scan_records(file_path, pattern, skip_header):
+    """Match records over a memory-mapped CSV, yielding a match per record
+
+    Raises ValueError if a record does not parse, so callers can fall back to csv.reader.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = mm.find(b'\n') + 1 if skip_header else 0
+            if skip_header and pos == 0:
+                return
+            size = len(mm)
+            match = pattern.match
+            while pos < size:
+                m = match(mm, pos)
+                if m is None or m.end() == pos:
+                    raise ValueError(f'unparsable CSV record at byte {pos} of {file_path}')
+                yield m
+                pos = m.end()
+
+
+def _read_csv_column_slow(file_path, index):
+    with open(file_path, newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return {row[index] for row in reader if len(row) > index}
+
+
+def read_csv_column(file_path, column):
+    """Return the set of values in one CSV column, or an empty set if the file has none"""
+    header = read_csv_header(file_path)
+    if not header or column not in header:
+        return set()
+    index = header.index(column)
+    try:
+        values = set()
+        for m in _scan_records(file_path, _column_pattern(index), skip_header=True):
+            value = m.group(1)
+            if value[:1] == b'"':
+                value = value[1:-1].replace(b'""', b'"')
+            values.add(value.decode('utf-8'))
+        return values
+    except FileNotFoundError:
+        return set()
+    except ValueError:
+        # Short rows or stray quotes; let the csv module decide
+        return _read_csv_column_slow(file_path, index)
+
+
+def unseen_rows(rows, known_urls):
+    """Rows whose url is not in known_urls, keeping the first of any repeats"""
+    seen = set()
+    new_rows = []
+    for row in rows:
+        url = row.get('url')
+        if url in known_urls or url in seen:
+            continue
+        seen.add(url)
+        new_rows.append(row)
+    return new_rows
+
+
+def count_csv_rows(file_path):
+    """Count data rows without building a DataFrame; quoted newlines stay inside their row"""
+    try:
+        return max(sum(1 for _ in _scan_records(file_path, _CSV_RECORD, skip_header=False)) - 1, 0)
+    except ValueError:
+        with open(file_path, newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+            return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+def row_count_path(file_path):
+    """Hidden sidecar next to a CSV holding '<size> <rows>'"""
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, f'.{name}.rowcount')
+
+
+def read_row_count(file_path):
+    """Row count from the sidecar, or None if it is missing or the CSV has changed size since"""
+    try:
+        with open(row_count_path(file_path)) as f:
+            size, count = map(int, f.read().split())
+        if size == os.path.getsize(file_path):
+            return count
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def write_row_count(file_path, count):
+    """Record the row count of a CSV at its current size"""
+    try:
+        with open(row_count_path(file_path), 'w') as f:
+            f.write(f'{os.path.getsize(file_path)} {count}')
+    except OSError:
+        pass
+
+
+def csv_row_count(file_path):
+    """Row count from the sidecar, recounting and refreshing it when stale"""
+    count = read_row_count(file_path)
+    if count is None:
+        count = count_csv_rows(file_path)
+        write_row_count(file_path, count)
+    return count
@@ -1,11 +1,17 @@
 import json
+import hashlib
+import itertools
 import logging
+import sqlite3
+import threading
+import time
+import zlib
 from googleapiclient.discovery import build, Resource
-from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
 import os
 import pickle
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any
 
 logger = logging.getLogger(__name__)
@@ -16,11 +22,74 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive.file'
 ]
 
+DEFAULT_TOKEN_FILE = '/tmp/secure/token.json'
+
+# Built API clients shared across instances, keyed by token file and mtime
+_SERVICE_CACHE = {}
+_SERVICE_CACHE_LOCK = threading.Lock()
+
+# Background token refresh: refresh this long before the token expires
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+_REFRESH_LOCK = threading.Lock()
+_refresher_thread = None
+
+# Stay under SQLite's host-parameter limit when checking URLs in bulk
+URL_LOOKUP_CHUNK_SIZE = 500
+
+
+def _token_file_paths():
+    """Return the JSON token path and the legacy pickle path it replaces"""
+    token_file = os.getenv('GOOGLE_TOKEN_FILE', DEFAULT_TOKEN_FILE)
+    base, ext = os.path.splitext(token_file)
+    if ext == '.pickle':
+        token_file = base + '.json'
+    
+    # If a bare relative name was configured, also try the secure location
+    if not os.path.exists(token_file) and token_file == 'token.json':
+        token_file = DEFAULT_TOKEN_FILE
+    
+    return token_file, os.path.splitext(token_file)[0] + '.pickle'
+
+
 class GoogleSheetsService:
     def __init__(self):
         self.service: Optional[Resource] = None
-        self.drive_service: Optional[Resource] = None
-        self._authenticate()
+        # Built clients and credentials, shared through _SERVICE_CACHE
+        self._clients: Dict[str, Any] = {}
+        # Sheet title -> sheet ID, per spreadsheet
+        self._known_sheets: Dict[str, Dict[str, int]] = {}
+        
+        cache_key = self._service_cache_key()
+        cached = _SERVICE_CACHE.get(cache_key) if cache_key else None
+        if cached:
+            self._clients = cached
+            self.service = cached['service']
+            return
+        
+        with _SERVICE_CACHE_LOCK:
+            self._authenticate()
+            # Refreshing may rewrite the token file, so key on the post-auth mtime
+            cache_key = self._service_cache_key()
+            if cache_key:
+                _SERVICE_CACHE.clear()
+                _SERVICE_CACHE[cache_key] = self._clients
+    
+    @property
+    def drive_service(self) -> Resource:
+        """Drive API client, built on first use"""
+        if self._clients.get('drive_service') is None:
+            self._clients['drive_service'] = build(
+                'drive', 'v3', credentials=self._clients['creds'], cache_discovery=False
+            )
+        return self._clients['drive_service']
+    
+    def _service_cache_key(self):
+        """Cache key for the built services, or None if there is no token file"""
+        token_file, _ = _token_file_paths()
+        try:
+            return (token_file, os.path.getmtime(token_file))
+        except OSError:
+            return None
     
     def _authenticate(self):
         """Authenticate using environment-managed credentials"""
@@ -31,8 +100,14 @@ class GoogleSheetsService:
             if not creds or not creds.valid:
                 if creds and creds.expired and creds.refresh_token:
                     try:
-                        creds.refresh(Request())
-                        self._save_credentials(creds)
+                        with _REFRESH_LOCK:
+                            # Another worker may have refreshed while we waited
+                            fresh_creds = self._load_credentials()
+                            if fresh_creds and fresh_creds.valid:
+                                creds = fresh_creds
+                            else:
+                                creds.refresh(Request())
+                                self._save_credentials(creds)
                     except Exception as e:
                         logger.error(f"Failed to refresh token: {e}")
                         raise Exception(
@@ -45,10 +120,12 @@ class GoogleSheetsService:
                         "python manage.py setup_google_auth"
                     )
             
-            self.service = build('sheets', 'v4', credentials=creds)
-            self.drive_service = build('drive', 'v3', credentials=creds)
+            self.service = build('sheets', 'v4', credentials=creds, cache_discovery=False)
+            self._clients = {'service': self.service, 'creds': creds, 'drive_service': None}
             logger.info("Google Sheets service initialized successfully")
             
+            self._start_token_refresher(creds)
+            
         except Exception as e:
             logger.error(f"Google Sheets authentication failed: {e}")
             raise Exception(
@@ -56,19 +133,80 @@ class GoogleSheetsService:
                 "Please ensure authentication is properly configured."
             )
     
+    def _start_token_refresher(self, creds):
+        """Start a daemon thread that refreshes the token before it expires"""
+        global _refresher_thread
+        
+        if not creds.refresh_token:
+            return
+        if _refresher_thread and _refresher_thread.is_alive():
+            return  # The running thread picks up the newest cached credentials
+        
+        _refresher_thread = threading.Thread(
+            target=self._refresh_loop,
+            name='google-token-refresher',
+            daemon=True
+        )
+        _refresher_thread.start()
+    
+    def _refresh_loop(self):
+        """Refresh credentials shortly before expiry so requests never wait on it"""
+        while True:
+            try:
+                with _SERVICE_CACHE_LOCK, _REFRESH_LOCK:
+                    wait_seconds = self._refresh_cached_credentials()
+            except Exception as e:
+                logger.error(f"Background token refresh failed: {e}")
+                wait_seconds = 60
+            time.sleep(wait_seconds)
+    
+    def _refresh_cached_credentials(self):
+        """Refresh the credentials in _SERVICE_CACHE if they are close to expiry
+        
+        Returns the number of seconds until the next check.
+        """
+        cache_key, clients = next(iter(_SERVICE_CACHE.items()), (None, None))
+        creds = clients['creds'] if clients else None
+        # Only refresh credentials built from the current token file; if it has
+        # changed since, they are stale and the next instance rebuilds from disk
+        if not creds or not creds.refresh_token or cache_key != self._service_cache_key():
+            return TOKEN_REFRESH_MARGIN.total_seconds()
+        
+        wait_seconds = self._seconds_until_refresh(creds)
+        if wait_seconds > 0:
+            return wait_seconds
+        
+        creds.refresh(Request())
+        self._save_credentials(creds)
+        logger.info("Google OAuth token refreshed in background")
+        
+        # The cached clients share these credentials; re-key them to the new token file
+        cache_key = self._service_cache_key()
+        _SERVICE_CACHE.clear()
+        if cache_key:
+            _SERVICE_CACHE[cache_key] = clients
+        return max(self._seconds_until_refresh(creds), TOKEN_REFRESH_MARGIN.total_seconds())
+    
+    @staticmethod
+    def _seconds_until_refresh(creds):
+        """Seconds until creds are within TOKEN_REFRESH_MARGIN of expiry"""
+        if not creds.expiry:
+            return 0
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (creds.expiry - TOKEN_REFRESH_MARGIN - now).total_seconds()
+    
     def _load_credentials(self):
         """Load credentials from secure storage"""
-        # Try environment variable first, then fallback to secure location
-        token_file = os.getenv('GOOGLE_TOKEN_FILE', '/tmp/secure/token.pickle')
+        token_file, legacy_token_file = _token_file_paths()
         
-        # If environment variable not set, also try the secure location
-        if not os.path.exists(token_file) and token_file == 'token.pickle':
-            token_file = '/tmp/secure/token.pickle'
+        # One-shot migration from the legacy pickled token
+        if not os.path.exists(token_file) and os.path.exists(legacy_token_file):
+            self._migrate_pickle_token(legacy_token_file)
         
         if os.path.exists(token_file):
             try:
-                with open(token_file, 'rb') as token:
-                    return pickle.load(token)
+                with open(token_file, 'r') as token:
+                    return Credentials.from_authorized_user_info(json.load(token), SCOPES)
             except Exception as e:
                 logger.error(f"Failed to load credentials from {token_file}: {e}")
                 return None
@@ -76,22 +214,34 @@ class GoogleSheetsService:
         logger.error(f"Token file not found at {token_file}")
         return None
     
+    def _migrate_pickle_token(self, legacy_token_file):
+        """Rewrite a legacy token.pickle as JSON and remove the pickle"""
+        try:
+            with open(legacy_token_file, 'rb') as token:
+                creds = pickle.load(token)
+            if self._save_credentials(creds):
+                os.remove(legacy_token_file)
+                logger.info(f"Migrated legacy token {legacy_token_file} to JSON")
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy token {legacy_token_file}: {e}")
+    
     def _save_credentials(self, creds):
         """Save credentials to secure storage"""
-        # Use secure location as default
-        token_file = os.getenv('GOOGLE_TOKEN_FILE', '/tmp/secure/token.pickle')
+        token_file, _ = _token_file_paths()
         
         try:
             # Ensure directory exists
-            os.makedirs(os.path.dirname(token_file), exist_ok=True)
+            os.makedirs(os.path.dirname(token_file) or '.', exist_ok=True)
             
-            with open(token_file, 'wb') as token:
-                pickle.dump(creds, token)
+            with open(token_file, 'w') as token:
+                token.write(creds.to_json())
             # Secure the file permissions
             os.chmod(token_file, 0o600)
             logger.info(f"Credentials saved to {token_file}")
+            return True
         except Exception as e:
             logger.error(f"Failed to save credentials to {token_file}: {e}")
+            return False
     
     def create_spreadsheet(self, title):
         """Create a new Google Spreadsheet"""
@@ -118,13 +268,27 @@ class GoogleSheetsService:
     def create_sheet_with_headers(self, spreadsheet_id, sheet_name, headers):
         """Create a new sheet with headers"""
         try:
-            # Add new sheet
+            # Pick the sheet ID up front so the header row can go in the same request
+            known_sheets = self._get_known_sheets(spreadsheet_id)
+            used_ids = set(known_sheets.values())
+            sheet_id = zlib.crc32(sheet_name.encode('utf-8')) & 0x7fffffff
+            while sheet_id in used_ids:
+                sheet_id = (sheet_id + 1) & 0x7fffffff
+            
+            # Add new sheet and its headers in one round-trip
             requests = [{
                 'addSheet': {
                     'properties': {
-                        'title': sheet_name
+                        'title': sheet_name,
+                        'sheetId': sheet_id
                     }
                 }
+            }, {
+                'updateCells': {
+                    'start': {'sheetId': sheet_id, 'rowIndex': 0, 'columnIndex': 0},
+                    'rows': [self._to_row_data(headers)],
+                    'fields': 'userEnteredValue'
+                }
             }]
             
             self.service.spreadsheets().batchUpdate(
@@ -132,8 +296,7 @@ class GoogleSheetsService:
                 body={'requests': requests}
             ).execute()
             
-            # Add headers
-            self.append_data(spreadsheet_id, sheet_name, [headers])
+            known_sheets[sheet_name] = sheet_id
             logger.info(f'Created sheet "{sheet_name}" with headers')
             
         except Exception as e:
@@ -163,15 +326,85 @@ class GoogleSheetsService:
             logger.error(f"Error appending data: {e}")
             raise
     
-    def read_sheet_data(self, spreadsheet_id, sheet_name, range_name=None):
-        """Read data from a sheet"""
+    def _get_sheet_ids(self, spreadsheet_id):
+        """Map sheet titles to numeric sheet IDs"""
+        spreadsheet = self.service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields='sheets.properties(sheetId,title)'
+        ).execute()
+        return {
+            sheet['properties']['title']: sheet['properties']['sheetId']
+            for sheet in spreadsheet.get('sheets', [])
+        }
+    
+    def _get_known_sheets(self, spreadsheet_id, refresh=False):
+        """Cached map of sheet titles to sheet IDs for a spreadsheet"""
+        if refresh or spreadsheet_id not in self._known_sheets:
+            self._known_sheets[spreadsheet_id] = self._get_sheet_ids(spreadsheet_id)
+        return self._known_sheets[spreadsheet_id]
+    
+    def _ensure_sheet(self, spreadsheet_id, sheet_name, headers):
+        """Create the sheet with headers unless it already exists
+        
+        Returns True if the sheet already existed.
+        """
+        if sheet_name in self._get_known_sheets(spreadsheet_id):
+            return True
+        self.create_sheet_with_headers(spreadsheet_id, sheet_name, headers)
+        return False
+    
+    @staticmethod
+    def _to_row_data(row):
+        """Convert a list of values to a Sheets RowData of raw strings"""
+        return {'values': [{'userEnteredValue': {'stringValue': str(value)}} for value in row]}
+    
+    def batch_append(self, spreadsheet_id, writes):
+        """Append rows to several sheets in a single batchUpdate request
+        
+        writes is a list of (sheet_name, rows) pairs.
+        """
+        try:
+            writes = [(sheet_name, rows) for sheet_name, rows in writes if rows]
+            if not writes:
+                return None
+            
+            sheet_ids = self._get_known_sheets(spreadsheet_id)
+            if any(sheet_name not in sheet_ids for sheet_name, _ in writes):
+                sheet_ids = self._get_known_sheets(spreadsheet_id, refresh=True)
+            requests = [{
+                'appendCells': {
+                    'sheetId': sheet_ids[sheet_name],
+                    'rows': [self._to_row_data(row) for row in rows],
+                    'fields': 'userEnteredValue'
+                }
+            } for sheet_name, rows in writes]
+            
+            result = self.service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={'requests': requests}
+            ).execute()
+            
+            for sheet_name, rows in writes:
+                logger.info(f'Appended {len(rows)} rows to {sheet_name}')
+            return result
+        
+        except Exception as e:
+            logger.error(f"Error batch appending data: {e}")
+            raise
+    
+    def read_sheet_data(self, spreadsheet_id, sheet_name, range_name=None, columns=None):
+        """Read data from a sheet
+        
+        columns narrows the read to a column range such as 'B:B'.
+        """
         try:
             if not range_name:
-                range_name = f"{sheet_name}!A:Z"
+                range_name = f"{sheet_name}!{columns or 'A:Z'}"
             
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=spreadsheet_id,
-                range=range_name
+                range=range_name,
+                fields='values'
             ).execute()
             
             values = result.get('values', [])
@@ -186,71 +419,157 @@ class GoogleSheetsService:
         """Get the URL of the spreadsheet"""
         return f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit"
     
+    def _url_cache_path(self, spreadsheet_id, sheet_name):
+        """Get the on-disk URL index path for a spreadsheet sheet"""
+        cache_dir = os.getenv('GOOGLE_URL_CACHE_DIR', '/tmp/secure')
+        key = hashlib.sha1(f"{spreadsheet_id}:{sheet_name}".encode('utf-8')).hexdigest()[:16]
+        return os.path.join(cache_dir, f"urls_{key}.sqlite")
+    
+    def _open_url_cache(self, spreadsheet_id, sheet_name):
+        """Open (and create if needed) the URL hash index for a sheet"""
+        cache_file = self._url_cache_path(spreadsheet_id, sheet_name)
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        conn = sqlite3.connect(cache_file)
+        conn.execute('CREATE TABLE IF NOT EXISTS urls (url_hash INTEGER PRIMARY KEY)')
+        return conn
+    
+    @staticmethod
+    def _url_hash(url):
+        """Stable 63-bit hash of a URL (the builtin hash() is salted per process)"""
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') & 0x7fffffffffffffff
+    
+    def _seed_url_cache(self, url_cache, spreadsheet_id, sheet_name, headers):
+        """Check an existing sheet's headers and seed its URL index from existing rows"""
+        header_rows = self.read_sheet_data(
+            spreadsheet_id, sheet_name, range_name=f"{sheet_name}!A1:Z1"
+        )
+        # Check if the sheet has proper headers
+        if not header_rows or header_rows[0] != headers:
+            # Sheet exists but no headers or wrong headers, recreate with proper headers
+            # Clear the sheet first
+            self.service.spreadsheets().values().clear(
+                spreadsheetId=spreadsheet_id,
+                range=f"{sheet_name}!A:Z"
+            ).execute()
+            # Add proper headers
+            self.append_data(spreadsheet_id, sheet_name, [headers])
+            return
+        
+        # Only the URL column is needed for dedup, so skip article bodies
+        url_rows = self.read_sheet_data(spreadsheet_id, sheet_name, columns='B:B')
+        url_cache.executemany(
+            'INSERT OR IGNORE INTO urls (url_hash) VALUES (?)',
+            (
+                (self._url_hash(row[0].strip()),)
+                for row in itertools.islice(url_rows, 1, None)  # Skip header row
+                if row and row[0]
+            )
+        )
+        url_cache.commit()
+    
+    @staticmethod
+    def _lookup_url_hashes(url_cache, url_hashes):
+        """Return the subset of url_hashes already present in the URL index"""
+        found = set()
+        for start in range(0, len(url_hashes), URL_LOOKUP_CHUNK_SIZE):
+            chunk = url_hashes[start:start + URL_LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(
+                url_hash for (url_hash,) in url_cache.execute(
+                    f'SELECT url_hash FROM urls WHERE url_hash IN ({placeholders})', chunk
+                )
+            )
+        return found
+    
     def store_news_data(self, spreadsheet_id, news_data, source=None):
         """Store news data in the appropriate sheet with deduplication"""
+        stored = self.store_news_batches(spreadsheet_id, [(source, news_data)])
+        return sum(stored.values())
+    
+    def store_news_batches(self, spreadsheet_id, batches):
+        """Store news data for several sources with one write request
+        
+        batches is a list of (source, news_data) pairs. Returns a dict of
+        sheet name to number of new rows stored.
+        """
+        url_caches = []
         try:
-            sheet_name = source or 'News_Data'
             headers = ['Title', 'URL', 'Date', 'Content', 'Source', 'Scraped_At']
+            scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            writes = []
+            pending_hashes = []
             
-            # Check if sheet exists, create if not
-            try:
-                existing_data = self.read_sheet_data(spreadsheet_id, sheet_name)
-                # Check if the sheet has proper headers
-                if not existing_data or (existing_data and existing_data[0] != headers):
-                    # Sheet exists but no headers or wrong headers, recreate with proper headers
-                    # Clear the sheet first
-                    self.service.spreadsheets().values().clear(
-                        spreadsheetId=spreadsheet_id,
-                        range=f"{sheet_name}!A:Z"
-                    ).execute()
-                    # Add proper headers
-                    self.append_data(spreadsheet_id, sheet_name, [headers])
-                    existing_data = [headers]
-            except:
-                self.create_sheet_with_headers(spreadsheet_id, sheet_name, headers)
-                existing_data = [headers]  # Just headers
-            
-            # Get existing URLs for deduplication
-            existing_urls = set()
-            if len(existing_data) > 1:  # More than just headers
-                url_column_index = 1  # URL is the second column (index 1)
-                for row in existing_data[1:]:  # Skip header row
-                    if len(row) > url_column_index and row[url_column_index]:
-                        existing_urls.add(row[url_column_index].strip())
-            
-            # Prepare data rows, filtering out duplicates
-            new_rows = []
-            skipped_count = 0
-            
-            for item in news_data:
-                url = item.get('url', '').strip()
-                if url and url not in existing_urls:
-                    row = [
-                        item.get('title', ''),
-                        url,
-                        item.get('date', ''),
-                        item.get('content', ''),
-                        item.get('source', source or ''),
-                        datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    ]
-                    new_rows.append(row)
-                    existing_urls.add(url)  # Add to set to prevent duplicates in this batch
+            for source, news_data in batches:
+                sheet_name = source or 'News_Data'
+                url_cache = self._open_url_cache(spreadsheet_id, sheet_name)
+                url_caches.append(url_cache)
+                
+                if not self._ensure_sheet(spreadsheet_id, sheet_name, headers):
+                    # Newly created (or recreated after being deleted), so any index is stale
+                    url_cache.execute('DELETE FROM urls')
+                    url_cache.commit()
+                elif url_cache.execute('SELECT 1 FROM urls LIMIT 1').fetchone() is None:
+                    # Only read the sheet when the local URL index is empty
+                    self._seed_url_cache(url_cache, spreadsheet_id, sheet_name, headers)
+                
+                # Hash the batch and look up which URLs are already stored
+                item_urls = [item.get('url', '').strip() for item in news_data]
+                item_hashes = [self._url_hash(url) if url else None for url in item_urls]
+                seen_hashes = self._lookup_url_hashes(
+                    url_cache, [url_hash for url_hash in item_hashes if url_hash is not None]
+                )
+                
+                # Prepare data rows, filtering out duplicates
+                new_rows = []
+                new_hashes = set()
+                skipped_count = 0
+                
+                for item, url, url_hash in zip(news_data, item_urls, item_hashes):
+                    if url and url_hash not in new_hashes and url_hash not in seen_hashes:
+                        row = [
+                            item.get('title', ''),
+                            url,
+                            item.get('date', ''),
+                            item.get('content', ''),
+                            item.get('source', source or ''),
+                            scraped_at
+                        ]
+                        new_rows.append(row)
+                        new_hashes.add(url_hash)  # Prevent duplicates in this batch
+                    else:
+                        skipped_count += 1
+                
+                if new_rows:
+                    writes.append((sheet_name, new_rows))
+                    pending_hashes.append((url_cache, new_hashes))
+                    if skipped_count > 0:
+                        logger.info(f'Skipped {skipped_count} duplicate items for {sheet_name}')
                 else:
-                    skipped_count += 1
+                    logger.info(f'No new items to store in {sheet_name} (all duplicates)')
             
-            if new_rows:
-                self.append_data(spreadsheet_id, sheet_name, new_rows)
-                logger.info(f'Stored {len(new_rows)} new items in {sheet_name}')
-                if skipped_count > 0:
-                    logger.info(f'Skipped {skipped_count} duplicate items')
-            else:
-                logger.info(f'No new items to store in {sheet_name} (all duplicates)')
+            if writes:
+                self.batch_append(spreadsheet_id, writes)
+                # Only index URLs once the rows are actually in the sheet
+                for url_cache, new_hashes in pending_hashes:
+                    url_cache.executemany(
+                        'INSERT OR IGNORE INTO urls (url_hash) VALUES (?)',
+                        ((url_hash,) for url_hash in new_hashes)
+                    )
+                    url_cache.commit()
+                for sheet_name, new_rows in writes:
+                    logger.info(f'Stored {len(new_rows)} new items in {sheet_name}')
             
-            return len(new_rows)
+            stored = {(source or 'News_Data'): 0 for source, _ in batches}
+            stored.update({sheet_name: len(new_rows) for sheet_name, new_rows in writes})
+            return stored
             
         except Exception as e:
             logger.error(f"Error storing news data: {e}")
             raise
+        finally:
+            for url_cache in url_caches:
+                url_cache.close()
     
     def get_all_news_data(self, spreadsheet_id):
         """Get all news data from all sheets"""
@@ -263,28 +582,37 @@ class GoogleSheetsService:
             sheets = spreadsheet.get('sheets', [])
             all_news = []
             
-            for sheet in sheets:
-                sheet_name = sheet['properties']['title']
-                if sheet_name == 'Sheet1':  # Skip default sheet
-                    continue
-                
+            sheet_names = [
+                sheet['properties']['title'] for sheet in sheets
+                if sheet['properties']['title'] != 'Sheet1'  # Skip default sheet
+            ]
+            if not sheet_names:
+                return all_news
+            
+            # Fetch every sheet in a single round-trip
+            result = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=[f"{sheet_name}!A:Z" for sheet_name in sheet_names]
+            ).execute()
+            value_ranges = result.get('valueRanges', [])
+            
+            for sheet_name, value_range in zip(sheet_names, value_ranges):
                 try:
-                    data = self.read_sheet_data(spreadsheet_id, sheet_name)
+                    data = value_range.get('values', [])
                     if data and len(data) > 1:  # Skip if only headers or empty
-                        headers = data[0]
+                        # Normalize header keys once per sheet, not per row
+                        keys = [header.lower().replace(' ', '_') for header in data[0]]
+                        num_keys = len(keys)
                         for row in data[1:]:
                             if row:  # Skip empty rows
-                                news_item = {}
-                                for i, header in enumerate(headers):
-                                    if i < len(row):
-                                        news_item[header.lower().replace(' ', '_')] = row[i]
-                                    else:
-                                        news_item[header.lower().replace(' ', '_')] = ''
-                                all_news.append(news_item)
+                                if len(row) < num_keys:
+                                    row = row + [''] * (num_keys - len(row))
+                                all_news.append(dict(zip(keys, row)))
                 except Exception as e:
                     logger.error(f"Error reading sheet {sheet_name}: {e}")
                     continue
             
+            logger.info(f'Read {len(sheet_names)} sheets in one batch request')
             return all_news
         
         except Exception as e:
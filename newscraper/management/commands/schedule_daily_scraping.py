@@ -1,5 +1,8 @@
 from django.core.management.base import BaseCommand
-from django.core.management import call_command
+from django.conf import settings
+import signal
+import subprocess
+import sys
 import time
 import threading
 from datetime import datetime, timedelta
@@ -7,6 +10,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Longest single sleep, so stop signals are honoured promptly
+POLL_INTERVAL_SECONDS = 60
+SCRAPE_TIMEOUT_SECONDS = 3600
+
 class Command(BaseCommand):
     help = 'Run daily scraping scheduler (alternative to cron for Replit)'
 
@@ -28,35 +35,55 @@ class Command(BaseCommand):
             """Run the daily scraping task"""
             try:
                 self.stdout.write(f'\\n🚀 Starting scheduled scraping at {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
-                call_command('scrape_all_sources', max_pages=3)
+                # Run in a child process so scraper memory is returned to the OS on exit
+                subprocess.run(
+                    [sys.executable, str(settings.BASE_DIR / 'manage.py'), 'scrape_all_sources', '--max-pages=3'],
+                    check=True,
+                    timeout=SCRAPE_TIMEOUT_SECONDS
+                )
                 self.stdout.write('✅ Scheduled scraping completed successfully')
+            except subprocess.TimeoutExpired:
+                self.stdout.write(self.style.ERROR('❌ Scheduled scraping timed out'))
+                logger.error(f'Scheduled scraping timed out after {SCRAPE_TIMEOUT_SECONDS}s')
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f'❌ Scheduled scraping failed: {e}'))
                 logger.error(f'Scheduled scraping failed: {e}')
         
-        def schedule_next_run():
+        def compute_next_run():
             """Calculate when to run next scraping"""
             now = datetime.now()
             
             # Calculate next target time (IST)
-            # For simplicity, we'll run every 24 hours from first execution
             next_run = now.replace(hour=target_hour, minute=0, second=0, microsecond=0)
             
             # If target time has passed today, schedule for tomorrow
             if now >= next_run:
                 next_run += timedelta(days=1)
             
-            wait_seconds = (next_run - now).total_seconds()
+            return next_run
+        
+        def wait_until(next_run):
+            """Sleep in short slices until next_run; returns False if stopped"""
+            wait_seconds = (next_run - datetime.now()).total_seconds()
             
             self.stdout.write(f'⏰ Next scraping scheduled for: {next_run.strftime("%Y-%m-%d %H:%M:%S")}')
             self.stdout.write(f'⏳ Waiting {wait_seconds/3600:.1f} hours until next run...')
             
-            # Wait and then run
-            time.sleep(wait_seconds)
-            run_daily_scraping()
-            
-            # Schedule next run
-            schedule_next_run()
+            # Measure the wait on the monotonic clock so wall-clock jumps can't cause double runs
+            deadline = time.monotonic() + wait_seconds
+            while not stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return True
+                stop_event.wait(min(POLL_INTERVAL_SECONDS, remaining))
+            return False
+        
+        stop_event = threading.Event()
+        
+        def handle_sigterm(signum, frame):
+            stop_event.set()
+        
+        signal.signal(signal.SIGTERM, handle_sigterm)
         
         try:
             # Run immediately first time
@@ -64,7 +91,10 @@ class Command(BaseCommand):
             run_daily_scraping()
             
             # Then schedule daily runs
-            schedule_next_run()
+            while wait_until(compute_next_run()):
+                run_daily_scraping()
+            
+            self.stdout.write('\\n⏹️ Daily scraping scheduler stopped')
             
         except KeyboardInterrupt:
             self.stdout.write('\\n⏹️ Daily scraping scheduler stopped by user')
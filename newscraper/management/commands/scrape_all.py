@@ -1,5 +1,13 @@
 from django.core.management.base import BaseCommand
-from django.core.management import call_command
+from newscraper.article_cache import DEFAULT_CACHE_TTL_HOURS
+import asyncio
+import logging
+from newscraper.s3_storage_service import S3StorageService
+from newscraper.scrapers import FinancialExpressScraper, LiveMintScraper, MoneyControlScraper, run_scrapers
+
+logger = logging.getLogger(__name__)
+
+SCRAPERS = [MoneyControlScraper, FinancialExpressScraper, LiveMintScraper]
 
 
 class Command(BaseCommand):
@@ -12,30 +20,44 @@ class Command(BaseCommand):
             default=3,
             help='Maximum number of pages to scrape per category',
         )
+        parser.add_argument(
+            '--cache-ttl',
+            type=float,
+            default=DEFAULT_CACHE_TTL_HOURS,
+            help='Hours to reuse cached article content (0 refetches everything)',
+        )
 
     def handle(self, *args, **options):
         max_pages = options['max_pages']
-        
-        scrapers = [
-            'scrape_moneycontrol',
-            'scrape_financialexpress',
-            'scrape_livemint',
-        ]
-        
+
         self.stdout.write('Starting to scrape all financial news sources...')
-        
-        for scraper in scrapers:
-            self.stdout.write(f'Running {scraper}...')
+
+        try:
+            storage_service = S3StorageService()
+        except Exception as e:
+            logger.error(f'Failed to initialise S3 storage: {e}')
+            self.stdout.write(self.style.ERROR(f'Failed to initialise S3 storage: {e}'))
+            return
+
+        # All sources run concurrently over one shared client and parse pool
+        scrapers = [scraper_class(stdout=self.stdout) for scraper_class in SCRAPERS]
+        results = asyncio.run(run_scrapers(scrapers, max_pages, options['cache_ttl']))
+
+        for scraper, result in zip(scrapers, results):
             try:
-                call_command(scraper, max_pages=max_pages)
+                if isinstance(result, Exception):
+                    raise result
+                if result:
+                    storage_service.store_news_data(result, scraper.storage_name)
                 self.stdout.write(
-                    self.style.SUCCESS(f'Successfully completed {scraper}')
+                    self.style.SUCCESS(f'Successfully completed {scraper.name}')
                 )
             except Exception as e:
+                logger.error(f'Failed to scrape {scraper.name}: {e}')
                 self.stdout.write(
-                    self.style.ERROR(f'Failed to run {scraper}: {e}')
+                    self.style.ERROR(f'Failed to run {scraper.name}: {e}')
                 )
-        
+
         self.stdout.write(
             self.style.SUCCESS('Completed scraping all sources')
-        )
\ No newline at end of file
+        )
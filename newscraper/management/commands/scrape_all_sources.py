@@ -1,9 +1,14 @@
 from django.core.management.base import BaseCommand
-from django.core.management import call_command
+from newscraper.article_cache import DEFAULT_CACHE_TTL_HOURS
+import asyncio
 import logging
+from newscraper.s3_storage_service import S3StorageService
+from newscraper.scrapers import FinancialExpressScraper, LiveMintScraper, MoneyControlScraper, run_scrapers
 
 logger = logging.getLogger(__name__)
 
+SCRAPERS = [MoneyControlScraper, LiveMintScraper, FinancialExpressScraper]
+
 class Command(BaseCommand):
     help = 'Run all news scrapers (MoneyControl, LiveMint, FinancialExpress)'
 
@@ -14,6 +19,12 @@ class Command(BaseCommand):
             default=2,
             help='Maximum number of pages to scrape per source',
         )
+        parser.add_argument(
+            '--cache-ttl',
+            type=float,
+            default=DEFAULT_CACHE_TTL_HOURS,
+            help='Hours to reuse cached article content (0 refetches everything)',
+        )
 
     def handle(self, *args, **options):
         max_pages = options['max_pages']
@@ -22,50 +33,57 @@ class Command(BaseCommand):
         self.stdout.write(f'📄 Max pages per source: {max_pages}')
         self.stdout.write('=' * 60)
         
-        scrapers = [
-            ('scrape_moneycontrol', 'MoneyControl'),
-            ('scrape_livemint', 'LiveMint'),
-            ('scrape_financialexpress', 'Financial Express')
-        ]
+        try:
+            storage = S3StorageService()
+        except Exception as e:
+            logger.error(f'Failed to initialise S3 storage: {e}')
+            self.stdout.write(self.style.ERROR(f'💥 Could not initialise S3 storage: {e}'))
+            return
+        
+        # Every source runs at once in this process, sharing one HTTP client,
+        # parse pool and article cache; each keeps its own per-host rate limit
+        scrapers = [scraper_class(stdout=self.stdout) for scraper_class in SCRAPERS]
+        self.stdout.write(f'\\n📰 Running {", ".join(scraper.name for scraper in scrapers)} scrapers...')
+        results = asyncio.run(run_scrapers(scrapers, max_pages, options['cache_ttl']))
         
         total_success = 0
         total_failed = 0
+        total_stored = 0
         
-        for command_name, source_name in scrapers:
+        for scraper, result in zip(scrapers, results):
             try:
-                self.stdout.write(f'\\n📰 Running {source_name} scraper...')
-                call_command(command_name, max_pages=max_pages)
-                self.stdout.write(self.style.SUCCESS(f'✅ {source_name} completed successfully'))
+                if isinstance(result, Exception):
+                    raise result
+                if result:
+                    total_stored += storage.store_news_data(result, scraper.storage_name)
+                self.stdout.write(self.style.SUCCESS(f'✅ {scraper.name} completed successfully ({len(result)} articles)'))
                 total_success += 1
                 
             except Exception as e:
-                self.stdout.write(self.style.ERROR(f'❌ {source_name} failed: {e}'))
-                logger.error(f'Failed to scrape {source_name}: {e}')
+                self.stdout.write(self.style.ERROR(f'❌ {scraper.name} failed: {e}'))
+                logger.error(f'Failed to scrape {scraper.name}: {e}')
                 total_failed += 1
         
         self.stdout.write('\\n' + '=' * 60)
         self.stdout.write(f'📊 Scraping Summary:')
-        self.stdout.write(f'   ✅ Successful: {total_success}/{len(scrapers)}')
-        self.stdout.write(f'   ❌ Failed: {total_failed}/{len(scrapers)}')
+        self.stdout.write(f'   ✅ Successful: {total_success}/{len(SCRAPERS)}')
+        self.stdout.write(f'   ❌ Failed: {total_failed}/{len(SCRAPERS)}')
         
         if total_success > 0:
             self.stdout.write('\\n🔍 Checking S3 storage status...')
             try:
-                from newscraper.s3_storage_service import S3StorageService
-                storage = S3StorageService()
                 info = storage.get_storage_info()
-                all_data = storage.get_all_news_data()
                 
-                self.stdout.write(f'📊 Total articles in S3: {len(all_data)}')
+                self.stdout.write(f'📊 Articles uploaded this run: {total_stored}')
                 self.stdout.write(f'📄 CSV files in S3: {info.get("total_files", 0)}')
                 self.stdout.write(f'💾 Total storage size: {info.get("total_size_mb", 0)} MB')
                 
             except Exception as e:
                 self.stdout.write(self.style.WARNING(f'⚠️ Could not check S3 status: {e}'))
         
-        if total_success == len(scrapers):
+        if total_success == len(SCRAPERS):
             self.stdout.write(self.style.SUCCESS('\\n🎉 All scrapers completed successfully!'))
         elif total_success > 0:
-            self.stdout.write(self.style.WARNING(f'\\n⚠️ Partial success: {total_success}/{len(scrapers)} scrapers completed'))
+            self.stdout.write(self.style.WARNING(f'\\n⚠️ Partial success: {total_success}/{len(SCRAPERS)} scrapers completed'))
         else:
             self.stdout.write(self.style.ERROR('\\n💥 All scrapers failed!'))
\ No newline at end of file
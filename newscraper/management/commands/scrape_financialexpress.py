@@ -1,10 +1,8 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-import httpx
 import logging
-from bs4 import BeautifulSoup
+from newscraper.article_cache import DEFAULT_CACHE_TTL_HOURS
 from newscraper.s3_storage_service import S3StorageService
-import os
+from newscraper.scrapers import FinancialExpressScraper
 
 logger = logging.getLogger(__name__)
 
@@ -19,113 +17,36 @@ class Command(BaseCommand):
             default=3,
             help='Maximum number of pages to scrape per category',
         )
+        parser.add_argument(
+            '--cache-ttl',
+            type=float,
+            default=DEFAULT_CACHE_TTL_HOURS,
+            help='Hours to reuse cached article content (0 refetches everything)',
+        )
 
     def handle(self, *args, **options):
         max_pages = options['max_pages']
-        categories = [
-            "business", "market", "industry", "economy", "personal-finance",
-            "opinion", "investing", "mutual-funds", "money", "auto", "technology"
-        ]
-        
+
         try:
             # Initialize S3 service for automatic upload
             storage_service = S3StorageService()
             self.stdout.write('Using AWS S3 for automatic cloud upload')
-            
-            all_articles = []
-            total_scraped = 0
-            
-            for category in categories:
-                self.stdout.write(f'Scraping Financial Express category: {category}')
-                articles = self.scrape_category(category, max_pages)
-                all_articles.extend(articles)
-                total_scraped += len(articles)
-                self.stdout.write(f'Scraped {len(articles)} articles from {category}')
-            
+
+            scraper = FinancialExpressScraper(cache_ttl=options['cache_ttl'], stdout=self.stdout)
+            all_articles = scraper.run(max_pages)
+            total_scraped = len(all_articles)
+
             # Store all articles in MEGA
             if all_articles:
-                stored_count = storage_service.store_news_data(all_articles, 'FinancialExpress')
+                stored_count = storage_service.store_news_data(all_articles, scraper.storage_name)
                 self.stdout.write(f'Uploaded {stored_count} articles to AWS S3')
-            
+
             self.stdout.write(
                 self.style.SUCCESS(f'Successfully scraped {total_scraped} articles from Financial Express and uploaded to AWS S3!')
             )
-            
+
         except Exception as e:
             logger.error(f'Failed to scrape Financial Express: {e}')
             self.stdout.write(
                 self.style.ERROR(f'Failed to scrape Financial Express: {e}')
             )
-
-    def scrape_category(self, category, max_pages):
-        base_url = "https://www.financialexpress.com"
-        articles = []
-        
-        for page in range(2, max_pages + 1):
-            url = f"{base_url}/{category}/page/{page}/"
-            
-            try:
-                resp = httpx.get(url, timeout=20)
-                if resp.status_code != 200:
-                    logger.warning(f"Page {page} returned {resp.status_code}")
-                    break
-                
-                posts = self.extract_posts_from_page(resp.text, category)
-                if not posts:
-                    logger.info(f"No posts found on page {page}")
-                    break
-                
-                articles.extend(posts)
-                        
-            except Exception as e:
-                logger.error(f"Error fetching page {page} for {category}: {e}")
-                break
-                
-        return articles
-
-    def extract_posts_from_page(self, html, category):
-        soup = BeautifulSoup(html, "html.parser")
-        posts = []
-        
-        for h2 in soup.find_all("h2", class_="entry-title"):
-            link_tag = h2.find("a")
-            if not link_tag:
-                continue
-                
-            url = link_tag["href"]
-            if not url.startswith("http"):
-                url = "https://www.financialexpress.com" + url
-                
-            title = link_tag.get_text(strip=True)
-            content = self.extract_article_content(url)
-            
-            if content:
-                posts.append({
-                    "title": title,
-                    "url": url,
-                    "date": timezone.now().strftime('%Y-%m-%d'),
-                    "content": content,
-                    "source": "financialexpress"
-                })
-            
-        return posts
-
-    def extract_article_content(self, url):
-        try:
-            resp = httpx.get(url, timeout=20)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
-            
-            article_div = soup.find("div", class_="article-section") \
-                          or soup.find("div", class_="post-content") \
-                          or soup.find("div", class_="entry-content")
-            
-            if article_div:
-                paragraphs = [p.get_text(strip=True) for p in article_div.find_all("p")]
-                return "\n\n".join(paragraphs)
-                
-            return ""
-        except Exception as e:
-            logger.error(f"Error extracting content from {url}: {e}")
-            return ""
-
@@ -0,0 +1,203 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from newscraper.article_cache import DEFAULT_CACHE_TTL_HOURS
+from newscraper.s3_storage_service import S3StorageService
+from newscraper.scrapers import FinancialExpressScraper, LiveMintScraper, MoneyControlScraper, run_scrapers
+from newscraper.scrapers.base import create_client
+
+logger = logging.getLogger(__name__)
+
+SCRAPERS_BY_SOURCE = {
+    scraper_class.source: scraper_class
+    for scraper_class in (MoneyControlScraper, LiveMintScraper, FinancialExpressScraper)
+}
+DEFAULT_QUEUE_DIR = os.getenv('SCRAPE_QUEUE_DIR', str(settings.BASE_DIR / 'scrape_queue'))
+# A running job's file is touched this often; one left untouched for JOB_STALE_SECONDS
+# belongs to a worker that died and goes back in the queue
+JOB_HEARTBEAT_SECONDS = 30
+JOB_STALE_SECONDS = 300
+
+
+def enqueue_job(queue_dir, job):
+    """Write a job file; the rename makes it visible to workers atomically"""
+    job_file = queue_dir / f'{time.time_ns()}.json'
+    tmp_file = job_file.with_suffix('.tmp')
+    tmp_file.write_text(json.dumps(job))
+    tmp_file.rename(job_file)
+    return job_file
+
+
+def claim_next_job(queue_dir):
+    """Claim the oldest queued job by renaming it, or return None"""
+    for job_file in sorted(queue_dir.glob('*.json')):
+        claimed = job_file.with_suffix('.running')
+        try:
+            # Renaming keeps the enqueue time, so stamp the claim time first
+            os.utime(job_file)
+            job_file.rename(claimed)
+        except FileNotFoundError:
+            # Another worker claimed it first
+            continue
+        return claimed
+    return None
+
+
+def requeue_orphaned_jobs(queue_dir):
+    """Put back running jobs whose worker stopped heartbeating and drop half-written job files
+
+    Returns the names of the requeued jobs.
+    """
+    now = time.time()
+    requeued = []
+    for running_file in queue_dir.glob('*.running'):
+        try:
+            if now - running_file.stat().st_mtime < JOB_STALE_SECONDS:
+                continue
+            running_file.rename(running_file.with_suffix('.json'))
+        except FileNotFoundError:
+            # Finished or requeued by another worker
+            continue
+        requeued.append(running_file.stem)
+
+    for tmp_file in queue_dir.glob('*.tmp'):
+        try:
+            if now - tmp_file.stat().st_mtime >= JOB_STALE_SECONDS:
+                tmp_file.unlink()
+        except FileNotFoundError:
+            pass
+    return requeued
+
+
+class Command(BaseCommand):
+    help = (
+        'Long-running scrape worker that keeps Django, the HTTP client and the parse pool warm. '
+        'Queue a job with --enqueue, or drop a JSON file such as {"max_pages": 3} into the queue directory.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue-dir',
+            default=DEFAULT_QUEUE_DIR,
+            help='Directory polled for *.json job files',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5,
+            help='Seconds between checks for new jobs',
+        )
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Queue one job with the options below and exit instead of running the worker',
+        )
+        parser.add_argument(
+            '--sources',
+            nargs='*',
+            choices=sorted(SCRAPERS_BY_SOURCE),
+            help='Sources to scrape (default: all)',
+        )
+        parser.add_argument(
+            '--max-pages',
+            type=int,
+            default=3,
+            help='Maximum number of pages to scrape per category',
+        )
+        parser.add_argument(
+            '--cache-ttl',
+            type=float,
+            default=DEFAULT_CACHE_TTL_HOURS,
+            help='Hours to reuse cached article content (0 refetches everything)',
+        )
+
+    def handle(self, *args, **options):
+        queue_dir = Path(options['queue_dir'])
+        queue_dir.mkdir(parents=True, exist_ok=True)
+
+        if options['enqueue']:
+            job_file = enqueue_job(queue_dir, {
+                'sources': options['sources'] or [],
+                'max_pages': options['max_pages'],
+                'cache_ttl': options['cache_ttl'],
+            })
+            self.stdout.write(self.style.SUCCESS(f'Queued scrape job {job_file.name}'))
+            return
+
+        self.stdout.write(f'👷 Scrape worker polling {queue_dir} every {options["poll_interval"]}s')
+        try:
+            asyncio.run(self.serve(queue_dir, options['poll_interval']))
+            self.stdout.write('⏹️ Scrape worker stopped')
+        except KeyboardInterrupt:
+            self.stdout.write('⏹️ Scrape worker stopped by user')
+
+    async def serve(self, queue_dir, poll_interval):
+        """Run queued jobs one at a time until SIGTERM"""
+        stop_event = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop_event.set)
+        storage_service = S3StorageService()
+
+        with ProcessPoolExecutor() as parse_pool:
+            async with create_client() as client:
+                while not stop_event.is_set():
+                    for job_name in requeue_orphaned_jobs(queue_dir):
+                        logger.warning(f'Requeued scrape job {job_name} left running by a dead worker')
+                    job_file = claim_next_job(queue_dir)
+                    if job_file is None:
+                        try:
+                            await asyncio.wait_for(stop_event.wait(), poll_interval)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+
+                    await self.run_job(job_file, client, parse_pool, storage_service)
+
+    async def heartbeat(self, job_file):
+        """Keep a running job's file fresh so it isn't requeued while this worker is alive"""
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                os.utime(job_file)
+            except FileNotFoundError:
+                return
+
+    async def run_job(self, job_file, client, parse_pool, storage_service):
+        """Scrape the sources in one job file and upload the results"""
+        heartbeat = asyncio.create_task(self.heartbeat(job_file))
+        try:
+            job = json.loads(job_file.read_text())
+            sources = job.get('sources') or list(SCRAPERS_BY_SOURCE)
+            scrapers = [SCRAPERS_BY_SOURCE[source](stdout=self.stdout) for source in sources]
+
+            self.stdout.write(f'🚀 Running job {job_file.stem}: {", ".join(sources)}')
+            results = await run_scrapers(
+                scrapers,
+                job.get('max_pages', 3),
+                job.get('cache_ttl', DEFAULT_CACHE_TTL_HOURS),
+                client=client,
+                parse_pool=parse_pool,
+            )
+
+            for scraper, result in zip(scrapers, results):
+                if isinstance(result, Exception):
+                    logger.error(f'Failed to scrape {scraper.name}: {result}')
+                    self.stdout.write(self.style.ERROR(f'❌ {scraper.name} failed: {result}'))
+                    continue
+                if result:
+                    # boto3 is blocking, so upload off the event loop
+                    await asyncio.to_thread(storage_service.store_news_data, result, scraper.storage_name)
+                self.stdout.write(self.style.SUCCESS(f'✅ {scraper.name}: {len(result)} articles'))
+
+        except Exception as e:
+            logger.error(f'Scrape job {job_file.name} failed: {e}')
+            self.stdout.write(self.style.ERROR(f'💥 Job {job_file.stem} failed: {e}'))
+        finally:
+            heartbeat.cancel()
+            job_file.unlink(missing_ok=True)
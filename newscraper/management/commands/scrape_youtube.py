@@ -1,18 +1,113 @@
 import os
+import atexit
 import csv
 import logging
-import pandas as pd
+import random
+import requests
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from yt_dlp import YoutubeDL
 from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
+from youtube_transcript_api._errors import (
+    TranscriptsDisabled, NoTranscriptFound, TooManyRequests, YouTubeRequestFailed
+)
 from newscraper.models import YouTubeScrapingJob
 from newscraper.s3_storage_service import S3StorageService
+from newscraper.transcript_cache import TranscriptCache
 
 logger = logging.getLogger(__name__)
 
+# Transcript requests are independent blocking round-trips, so overlap them
+TRANSCRIPT_WORKERS = 10
+TRANSCRIPT_ATTEMPTS = 5
+MAX_TRANSCRIPT_RETRY_DELAY = 30
+# Optional cap on stored transcript length; 0 keeps the full text
+TRANSCRIPT_MAX_CHARS = int(os.getenv('TRANSCRIPT_MAX_CHARS', '0'))
+# Throttling and dropped connections are worth retrying; a missing transcript is not
+TRANSIENT_TRANSCRIPT_ERRORS = (
+    TooManyRequests, YouTubeRequestFailed, requests.ConnectionError, requests.Timeout
+)
+# CSV columns, in the order rows are built below
+VIDEO_FIELDS = [
+    'title', 'url', 'video_id', 'duration', 'channel', 'views',
+    'scraped_at', 'keyword', 'job_id'
+]
+TRANSCRIPT_FIELDS = [
+    'video_title', 'video_url', 'video_id', 'transcript_text', 'transcript_length',
+    'scraped_at', 'keyword', 'job_id'
+]
+
+VIEW_SCALES = ((1_000_000_000, 'B'), (1_000_000, 'M'), (1_000, 'K'))
+
+YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': False,
+    'noplaylist': True,
+    'skip_download': True,
+    # Flat search entries already carry title, id, duration, uploader and
+    # view count, so no per-video info requests are made
+    'extract_flat': 'in_playlist',
+    'extractor_args': {
+        'youtube': {
+            'player_client': ['ios', 'android', 'web'],
+            'skip': ['dash', 'hls']
+        }
+    },
+    'http_headers': {
+        'User-Agent': 'com.google.ios.youtube/19.29.1 (iPhone16,2; U; CPU iOS 17_5_1 like Mac OS X;)',
+    }
+}
+_ydl = None
+# YoutubeDL is not reentrant, so searches on the shared instance take turns
+_ydl_lock = threading.Lock()
+
+
+def get_youtube_dl():
+    """Return a process-wide YoutubeDL so its extractors and HTTP connections are reused"""
+    global _ydl
+    with _ydl_lock:
+        if _ydl is None:
+            _ydl = YoutubeDL(YDL_OPTS)
+            atexit.register(_ydl.close)
+    return _ydl
+
+
+def join_transcript(entries, max_chars=TRANSCRIPT_MAX_CHARS):
+    """Join transcript segments into one string, stopping once max_chars is reached"""
+    if not max_chars:
+        return ' '.join(entry['text'] for entry in entries)
+
+    parts = []
+    length = 0
+    for entry in entries:
+        parts.append(entry['text'])
+        length += len(entry['text']) + 1
+        if length > max_chars:
+            break
+    return ' '.join(parts)[:max_chars]
+
+
+def fetch_transcript(video_id):
+    """Fetch one transcript as text, backing off with jitter when YouTube throttles"""
+    for attempt in range(TRANSCRIPT_ATTEMPTS):
+        try:
+            # Joined on the worker so only the text waits for the consumer, not every segment dict
+            return join_transcript(YouTubeTranscriptApi.get_transcript(video_id))
+        except TRANSIENT_TRANSCRIPT_ERRORS as e:
+            if attempt == TRANSCRIPT_ATTEMPTS - 1:
+                raise
+            delay = random.uniform(0, min(MAX_TRANSCRIPT_RETRY_DELAY, 2 ** (attempt + 1)))
+            logger.warning(
+                f'Transcript request for {video_id} failed (attempt {attempt + 1}), '
+                f'retrying in {delay:.1f}s: {type(e).__name__}'
+            )
+            time.sleep(delay)
+
 
 class Command(BaseCommand):
     help = 'Scrape YouTube videos and transcripts for a given keyword'
@@ -41,7 +136,7 @@ class Command(BaseCommand):
             
             job.status = 'searching'
             job.started_at = timezone.now()
-            job.save()
+            job.save(update_fields=['status', 'started_at'])
             
             videos_data = self.search_youtube_videos(job.keyword)
             
@@ -52,27 +147,38 @@ class Command(BaseCommand):
                     'For Replit, consider using Google YouTube Data API v3 instead of yt-dlp.'
                 )
             
-            videos_s3_key = self.upload_videos_to_s3(s3_service, job, videos_data)
-            job.videos_csv_path = videos_s3_key
-            job.videos_found = len(videos_data)
-            job.save()
-            
-            self.stdout.write(self.style.SUCCESS(f'Found {len(videos_data)} videos, uploaded to S3: {videos_s3_key}'))
+            self.stdout.write(self.style.SUCCESS(f'Found {len(videos_data)} videos'))
             
+            job.videos_found = len(videos_data)
             job.status = 'fetching_transcripts'
-            job.save()
+            job.save(update_fields=['videos_found', 'status'])
             
-            transcripts_data = self.fetch_transcripts(videos_data)
+            # The video list uploads in the background while transcripts are fetched
+            with ThreadPoolExecutor(max_workers=1) as upload_executor:
+                videos_upload = upload_executor.submit(self.upload_videos_to_s3, s3_service, job, videos_data)
+                
+                try:
+                    # Transcripts are written to the CSV as they arrive rather than held in memory
+                    transcripts_s3_key, transcripts_fetched = self.upload_transcripts_to_s3(
+                        s3_service, job, self.fetch_transcripts(videos_data)
+                    )
+                finally:
+                    # Record the uploaded video list even if the transcript step fails
+                    if videos_upload.exception() is None:
+                        job.videos_csv_path = videos_upload.result()
+                        job.save(update_fields=['videos_csv_path'])
+                videos_upload.result()
             
-            transcripts_s3_key = self.upload_transcripts_to_s3(s3_service, job, transcripts_data)
             job.transcripts_csv_path = transcripts_s3_key
-            job.transcripts_fetched = len(transcripts_data)
+            job.transcripts_fetched = transcripts_fetched
             job.status = 'completed'
             job.completed_at = timezone.now()
-            job.save()
+            job.save(update_fields=[
+                'transcripts_csv_path', 'transcripts_fetched', 'status', 'completed_at'
+            ])
             
             self.stdout.write(self.style.SUCCESS(
-                f'Completed! Fetched {len(transcripts_data)} transcripts, uploaded to S3: {transcripts_s3_key}'
+                f'Completed! Fetched {transcripts_fetched} transcripts, uploaded to S3: {transcripts_s3_key}'
             ))
             
         except Exception as e:
@@ -80,7 +186,7 @@ class Command(BaseCommand):
             job.status = 'failed'
             job.error_message = str(e)
             job.completed_at = timezone.now()
-            job.save()
+            job.save(update_fields=['status', 'error_message', 'completed_at'])
             self.stdout.write(self.style.ERROR(f'Failed: {str(e)}'))
 
     def search_youtube_videos(self, keyword, max_results=20):
@@ -88,48 +194,33 @@ class Command(BaseCommand):
         self.stdout.write(f'Searching YouTube for: {keyword}')
         
         try:
-            ydl_opts = {
-                'quiet': False,
-                'no_warnings': False,
-                'noplaylist': True,
-                'extract_flat': 'in_playlist',
-                'extractor_args': {
-                    'youtube': {
-                        'player_client': ['ios', 'android', 'web'],
-                        'skip': ['dash', 'hls']
-                    }
-                },
-                'http_headers': {
-                    'User-Agent': 'com.google.ios.youtube/19.29.1 (iPhone16,2; U; CPU iOS 17_5_1 like Mac OS X;)',
-                }
-            }
-            
-            with YoutubeDL(ydl_opts) as ydl:
-                self.stdout.write(f'Extracting video information...')
+            ydl = get_youtube_dl()
+            self.stdout.write(f'Extracting video information...')
+            with _ydl_lock:
                 result = ydl.extract_info(
                     f"ytsearch{max_results}:{keyword}",
                     download=False
                 )
-                
-                videos_data = []
-                if result and 'entries' in result:
-                    self.stdout.write(f'Found {len(result["entries"])} entries')
-                    for idx, video in enumerate(result['entries'], 1):
-                        if video:
-                            self.stdout.write(f'Processing video {idx}: {video.get("title", "Unknown")[:50]}...')
-                            videos_data.append({
-                                'title': video.get('title', 'N/A'),
-                                'url': video.get('webpage_url') or video.get('url') or f"https://www.youtube.com/watch?v={video.get('id', '')}",
-                                'video_id': video.get('id', 'N/A'),
-                                'duration': self._format_duration(video.get('duration', 0)),
-                                'channel': video.get('uploader', video.get('channel', 'N/A')),
-                                'views': self._format_views(video.get('view_count', 0))
-                            })
-                else:
-                    self.stdout.write('No entries found in result')
-                
-                return videos_data
-                
+            
+            videos_data = []
+            if result and 'entries' in result:
+                self.stdout.write(f'Found {len(result["entries"])} entries')
+                for idx, video in enumerate(result['entries'], 1):
+                    if video:
+                        self.stdout.write(f'Processing video {idx}: {video.get("title", "Unknown")[:50]}...')
+                        videos_data.append({
+                            'title': video.get('title', 'N/A'),
+                            'url': video.get('webpage_url') or video.get('url') or f"https://www.youtube.com/watch?v={video.get('id', '')}",
+                            'video_id': video.get('id', 'N/A'),
+                            'duration': self._format_duration(video.get('duration', 0)),
+                            'channel': video.get('uploader', video.get('channel', 'N/A')),
+                            'views': self._format_views(video.get('view_count', 0))
+                        })
+            else:
+                self.stdout.write('No entries found in result')
+            
+            return videos_data
+            
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error in YouTube search: {str(e)}'))
             raise Exception(f'YouTube search failed: {str(e)}')
@@ -138,9 +229,9 @@ class Command(BaseCommand):
         """Format duration from seconds to readable format"""
         if not duration_seconds:
             return 'N/A'
-        hours = duration_seconds // 3600
-        minutes = (duration_seconds % 3600) // 60
-        seconds = duration_seconds % 60
+        # Flat search results can report fractional seconds
+        minutes, seconds = divmod(int(duration_seconds), 60)
+        hours, minutes = divmod(minutes, 60)
         if hours:
             return f"{hours}:{minutes:02d}:{seconds:02d}"
         return f"{minutes}:{seconds:02d}"
@@ -149,72 +240,101 @@ class Command(BaseCommand):
         """Format view count to readable format"""
         if not view_count:
             return 'N/A'
-        if view_count >= 1000000:
-            return f"{view_count / 1000000:.1f}M views"
-        elif view_count >= 1000:
-            return f"{view_count / 1000:.1f}K views"
+        for scale, suffix in VIEW_SCALES:
+            if view_count >= scale:
+                return f"{view_count / scale:.1f}{suffix} views"
         return f"{view_count} views"
 
     def upload_videos_to_s3(self, s3_service, job, videos_data):
         """Upload video list to S3 as CSV"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        df = pd.DataFrame(videos_data)
-        df['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        df['keyword'] = job.keyword
-        df['job_id'] = job.id
+        job_columns = (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), job.keyword, job.id)
         
         s3_key = f"{s3_service.prefix}/{s3_service.env}/youtube/videos/youtube_videos_{job.id}_{timestamp}.csv"
         
-        s3_service._upload_csv_to_s3(df, s3_key)
+        self._upload_rows_to_s3(s3_service, s3_key, VIDEO_FIELDS, (
+            (v['title'], v['url'], v['video_id'], v['duration'], v['channel'], v['views'], *job_columns)
+            for v in videos_data
+        ))
         self.stdout.write(self.style.SUCCESS(f'Uploaded videos CSV to S3: {s3_key}'))
         
         return s3_key
 
     def fetch_transcripts(self, videos_data):
-        """Fetch transcripts for each video"""
-        transcripts_data = []
-        
-        for idx, video in enumerate(videos_data, 1):
-            video_id = video['video_id']
-            self.stdout.write(f'Fetching transcript {idx}/{len(videos_data)}: {video["title"][:50]}...')
+        """Fetch transcripts for each video, yielding them one at a time"""
+        transcript_cache = TranscriptCache()
+        try:
+            # Videos seen by a recent job skip YouTube entirely
+            cached = transcript_cache.get_many(video['video_id'] for video in videos_data)
             
-            try:
-                transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-                
-                transcript_text = ' '.join([entry['text'] for entry in transcript_list])
-                
-                transcripts_data.append({
-                    'video_title': video['title'],
-                    'video_url': video['url'],
-                    'video_id': video_id,
-                    'transcript_text': transcript_text,
-                    'transcript_length': len(transcript_text)
-                })
-                
-                self.stdout.write(self.style.SUCCESS(f'  ✓ Transcript fetched ({len(transcript_text)} chars)'))
+            with ThreadPoolExecutor(max_workers=TRANSCRIPT_WORKERS) as executor:
+                futures = {
+                    video['video_id']: executor.submit(fetch_transcript, video['video_id'])
+                    for video in videos_data
+                    if video['video_id'] not in cached
+                }
                 
-            except (TranscriptsDisabled, NoTranscriptFound) as e:
-                self.stdout.write(self.style.WARNING(f'  ✗ Transcript not available: {str(e)}'))
-                continue
-            except Exception as e:
-                self.stdout.write(self.style.WARNING(f'  ✗ Error: {str(e)}'))
-                continue
-        
-        return transcripts_data
+                # Collect in search order; later videos keep downloading meanwhile
+                for idx, video in enumerate(videos_data, 1):
+                    video_id = video['video_id']
+                    self.stdout.write(f'Fetching transcript {idx}/{len(videos_data)}: {video["title"][:50]}...')
+                    
+                    try:
+                        if video_id in cached:
+                            transcript_text = cached[video_id]
+                            self.stdout.write(self.style.SUCCESS(f'  ✓ Transcript cached ({len(transcript_text)} chars)'))
+                        else:
+                            transcript_text = futures[video_id].result()
+                            transcript_cache.put(video_id, transcript_text)
+                            
+                            self.stdout.write(self.style.SUCCESS(f'  ✓ Transcript fetched ({len(transcript_text)} chars)'))
+                        
+                        yield {
+                            'video_title': video['title'],
+                            'video_url': video['url'],
+                            'video_id': video_id,
+                            'transcript_text': transcript_text,
+                            'transcript_length': len(transcript_text)
+                        }
+                        
+                    except (TranscriptsDisabled, NoTranscriptFound) as e:
+                        self.stdout.write(self.style.WARNING(f'  ✗ Transcript not available: {str(e)}'))
+                        continue
+                    except Exception as e:
+                        self.stdout.write(self.style.WARNING(f'  ✗ Error: {str(e)}'))
+                        continue
+        finally:
+            transcript_cache.close()
 
-    def upload_transcripts_to_s3(self, s3_service, job, transcripts_data):
-        """Upload transcripts to S3 as CSV"""
+    def upload_transcripts_to_s3(self, s3_service, job, transcripts):
+        """Write transcripts to a CSV as they arrive, upload it to S3 and return (key, row count)"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        df = pd.DataFrame(transcripts_data)
-        df['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        df['keyword'] = job.keyword
-        df['job_id'] = job.id
+        job_columns = (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), job.keyword, job.id)
         
         s3_key = f"{s3_service.prefix}/{s3_service.env}/youtube/transcripts/youtube_transcripts_{job.id}_{timestamp}.csv"
         
-        s3_service._upload_csv_to_s3(df, s3_key)
+        row_count = self._upload_rows_to_s3(s3_service, s3_key, TRANSCRIPT_FIELDS, (
+            (t['video_title'], t['video_url'], t['video_id'], t['transcript_text'], t['transcript_length'], *job_columns)
+            for t in transcripts
+        ))
         self.stdout.write(self.style.SUCCESS(f'Uploaded transcripts CSV to S3: {s3_key}'))
         
-        return s3_key
+        return s3_key, row_count
+
+    def _upload_rows_to_s3(self, s3_service, s3_key, fieldnames, rows):
+        """Write row tuples to a temporary CSV, upload it to S3 and return the row count"""
+        row_count = 0
+        csvfile = tempfile.NamedTemporaryFile('w', newline='', encoding='utf-8', suffix='.csv', delete=False)
+        try:
+            with csvfile:
+                writer = csv.writer(csvfile, lineterminator='\n')
+                writer.writerow(fieldnames)
+                for row in rows:
+                    writer.writerow(row)
+                    row_count += 1
+            
+            s3_service._upload_csv_file_to_s3(csvfile.name, s3_key)
+        finally:
+            os.remove(csvfile.name)
+        
+        return row_count
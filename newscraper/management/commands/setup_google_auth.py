@@ -5,10 +5,18 @@ This handles the OAuth flow securely without committing credentials.
 
 import os
 import json
-import pickle
+import functools
 from django.core.management.base import BaseCommand, CommandError
 from google_auth_oauthlib.flow import Flow, InstalledAppFlow
 from google.auth.transport.requests import Request
+from newscraper.google_sheets_service import SCOPES
+
+
+@functools.lru_cache(maxsize=None)
+def load_client_config(credentials_file):
+    """Read and parse an OAuth client secrets file once"""
+    with open(credentials_file, 'r') as f:
+        return json.load(f)
 
 
 class Command(BaseCommand):
@@ -63,6 +71,22 @@ class Command(BaseCommand):
             )
         )
 
+    def build_flow(self, credentials_file):
+        """Build the OAuth flow from the parsed client secrets"""
+        creds_data = load_client_config(credentials_file)
+
+        # Determine flow type based on credentials
+        if 'web' in creds_data:
+            # Web application flow
+            return Flow.from_client_config(
+                creds_data,
+                scopes=SCOPES,
+                redirect_uri='http://localhost'
+            )
+
+        # Desktop application flow
+        return InstalledAppFlow.from_client_config(creds_data, SCOPES)
+
     def generate_auth_url(self, credentials_file):
         """Generate OAuth authorization URL"""
         if not credentials_file:
@@ -74,28 +98,7 @@ class Command(BaseCommand):
             raise CommandError(f'Credentials file not found: {credentials_file}')
 
         try:
-            # Determine flow type based on credentials
-            with open(credentials_file, 'r') as f:
-                creds_data = json.load(f)
-
-            scopes = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive.file'
-            ]
-
-            if 'web' in creds_data:
-                # Web application flow
-                flow = Flow.from_client_secrets_file(
-                    credentials_file,
-                    scopes=scopes,
-                    redirect_uri='http://localhost'
-                )
-            else:
-                # Desktop application flow
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    credentials_file, 
-                    scopes
-                )
+            flow = self.build_flow(credentials_file)
 
             auth_url, _ = flow.authorization_url(prompt='consent')
 
@@ -126,36 +129,17 @@ class Command(BaseCommand):
             raise CommandError(f'Credentials file not found: {credentials_file}')
 
         try:
-            # Determine flow type
-            with open(credentials_file, 'r') as f:
-                creds_data = json.load(f)
-
-            scopes = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive.file'
-            ]
-
-            if 'web' in creds_data:
-                # Web application flow
-                flow = Flow.from_client_secrets_file(
-                    credentials_file,
-                    scopes=scopes,
-                    redirect_uri='http://localhost'
-                )
-            else:
-                # Desktop application flow
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    credentials_file, 
-                    scopes
-                )
+            flow = self.build_flow(credentials_file)
 
             # Exchange authorization code for tokens
             flow.fetch_token(code=auth_code)
 
             # Save credentials securely
-            token_file = os.getenv('GOOGLE_TOKEN_FILE', 'token.pickle')
-            with open(token_file, 'wb') as token:
-                pickle.dump(flow.credentials, token)
+            token_file = os.getenv('GOOGLE_TOKEN_FILE', 'token.json')
+            if token_file.endswith('.pickle'):
+                token_file = token_file[:-len('.pickle')] + '.json'
+            with open(token_file, 'w') as token:
+                token.write(flow.credentials.to_json())
 
             # Secure file permissions
             os.chmod(token_file, 0o600)
@@ -1,21 +1,40 @@
 import os
+import numpy as np
 import pandas as pd
 import logging
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import requests
 import time
+from .csv_utils import append_csv_rows, read_csv_header, row_fieldnames, write_csv_rows
+from .news_frames import add_search_columns, filter_news_df, news_records, sort_by_date
 
 logger = logging.getLogger(__name__)
 
+NEWS_SOURCES = ['moneycontrol', 'livemint', 'financialexpress']
+# Combined DataFrames keyed by the (path, mtime, size) of every source file
+_NEWS_DF_CACHE = OrderedDict()
+NEWS_DF_CACHE_SIZE = 4
+# Request threads share the cache
+_NEWS_DF_CACHE_LOCK = threading.Lock()
+# Rows per chunk when rewriting a CSV, bounding memory regardless of file size
+CSV_CHUNK_SIZE = 65536
+
 class MegaCSVStorageService:
     """MEGA cloud storage service for CSV files using direct HTTP API calls"""
     
+    # One worker so appends to the same file reach MEGA in order
+    _upload_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mega-upload')
+    
     def __init__(self):
         self.base_url = "https://g.api.mega.co.nz"
         self.seq_no = 0
         self.sid = None
+        self._pending_uploads = []
         self._authenticate()
     
     def _authenticate(self):
@@ -52,44 +71,22 @@ class MegaCSVStorageService:
             if not data:
                 return 0
             
-            # Create DataFrame
-            df = pd.DataFrame(data)
-            
             # Add scraped_at timestamp
-            df['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = [{**item, 'scraped_at': scraped_at} for item in data]
             
             # Create CSV filename
             filename = f"{source.lower()}_news_data.csv"
-            local_file = os.path.join(tempfile.gettempdir(), filename)
-            
-            # Load existing data if available
-            existing_df = self._download_csv_from_mega(filename)
-            
-            if existing_df is not None:
-                # Merge with existing data, avoiding duplicates based on URL
-                combined_df = pd.concat([existing_df, df], ignore_index=True)
-                combined_df = combined_df.drop_duplicates(subset=['url'], keep='last')
-            else:
-                combined_df = df
-            
-            # Save to local CSV file
-            combined_df.to_csv(local_file, index=False)
             
-            # Upload to MEGA (simplified approach)
-            success = self._upload_csv_to_mega(local_file, filename)
+            # Append only the new rows; URL duplicates are dropped on read and by compact()
+            success = self._append_csv_to_mega(rows, filename)
             
             if success:
-                logger.info(f"Successfully uploaded {filename} to MEGA")
+                logger.info(f"Appended {len(rows)} rows to {filename}")
             else:
-                logger.warning(f"Failed to upload to MEGA, keeping local file: {local_file}")
+                logger.warning(f"Failed to append {filename} to MEGA")
             
-            # Clean up local temp file
-            try:
-                os.remove(local_file)
-            except:
-                pass
-            
-            new_records = len(df)
+            new_records = len(rows)
             logger.info(f"Successfully stored {new_records} new articles for {source}")
             return new_records
             
@@ -97,94 +94,234 @@ class MegaCSVStorageService:
             logger.error(f"Failed to store news data: {e}")
             raise
     
-    def get_all_news_data(self) -> List[Dict[str, Any]]:
-        """Download and combine all news data from MEGA CSV files"""
+    def _news_files_key(self) -> tuple:
+        """Identify the current version of every stored news file"""
+        key = []
+        for directory in ('.mega_cloud_storage', '.mega_backup'):
+            for source in NEWS_SOURCES:
+                path = os.path.join(os.getcwd(), directory, f"{source}_news_data.csv")
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                key.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(key)
+    
+    def get_all_news_df(self) -> pd.DataFrame:
+        """Download and combine all news data from MEGA CSV files into one DataFrame
+        
+        The result is cached until a source file changes, so treat it as read-only.
+        It also carries lowercased search columns; news_records() drops them.
+        """
+        cache_key = self._news_files_key()
+        with _NEWS_DF_CACHE_LOCK:
+            if cache_key in _NEWS_DF_CACHE:
+                _NEWS_DF_CACHE.move_to_end(cache_key)
+                return _NEWS_DF_CACHE[cache_key]
+        
         try:
-            all_data = []
-            sources = ['moneycontrol', 'livemint', 'financialexpress']
-            
-            for source in sources:
-                filename = f"{source}_news_data.csv"
-                df = self._download_csv_from_mega(filename)
-                if df is not None and not df.empty:
-                    # Add source if not present
-                    if 'source' not in df.columns:
-                        df['source'] = source.title()
-                    all_data.append(df)
-            
-            if all_data:
-                combined_df = pd.concat(all_data, ignore_index=True)
-                # Sort by date (newest first)
-                if 'date' in combined_df.columns:
-                    combined_df['date'] = pd.to_datetime(combined_df['date'], errors='coerce')
-                    combined_df = combined_df.sort_values('date', ascending=False, na_position='last')
-                
-                return combined_df.to_dict('records')
-            
-            return []
-            
+            combined_df = self._load_news_df()
         except Exception as e:
             logger.error(f"Failed to retrieve news data: {e}")
-            return []
+            return pd.DataFrame()
+        
+        with _NEWS_DF_CACHE_LOCK:
+            _NEWS_DF_CACHE[cache_key] = combined_df
+            while len(_NEWS_DF_CACHE) > NEWS_DF_CACHE_SIZE:
+                _NEWS_DF_CACHE.popitem(last=False)
+        return combined_df
+    
+    def _load_news_df(self) -> pd.DataFrame:
+        """Read and combine the news CSV files"""
+        all_data = []
+        
+        for source in NEWS_SOURCES:
+            filename = f"{source}_news_data.csv"
+            df = self._download_csv_from_mega(filename)
+            if df is not None and not df.empty:
+                # Files are append-only, so the latest copy of each article wins
+                if 'url' in df.columns:
+                    df = df.drop_duplicates(subset=['url'], keep='last')
+                
+                # Add source if not present
+                if 'source' not in df.columns:
+                    df['source'] = source.title()
+                all_data.append(df)
+        
+        if all_data:
+            combined_df = pd.concat(all_data, ignore_index=True)
+            return add_search_columns(sort_by_date(combined_df))
+        
+        return pd.DataFrame()
+    
+    def get_all_news_data(self) -> List[Dict[str, Any]]:
+        """Download and combine all news data from MEGA CSV files"""
+        return news_records(self.get_all_news_df())
+    
+    def _append_csv_to_mega(self, rows: List[Dict[str, Any]], filename: str) -> bool:
+        """Append rows to the local backup and queue the MEGA upload in the background"""
+        # The local backup is the durable copy, so the caller doesn't wait on MEGA
+        if not self._append_local_backup(rows, filename):
+            return False
+        
+        if not self.email or not self.password:
+            logger.warning("MEGA credentials not available, storing locally only")
+            return True
+        
+        # A brand-new cloud file is seeded from the backup up to and including these rows
+        backup_size = os.path.getsize(os.path.join(os.getcwd(), '.mega_backup', filename))
+        self._pending_uploads.append(
+            self._upload_pool.submit(self._append_to_mega_cloud, rows, filename, backup_size)
+        )
+        return True
     
-    def _upload_csv_to_mega(self, local_file_path: str, filename: str) -> bool:
-        """Upload CSV file to MEGA using direct API"""
+    def _append_to_mega_cloud(self, rows: List[Dict[str, Any]], filename: str, backup_size: int) -> bool:
+        """Append rows to a CSV file on MEGA using direct API"""
+        # Try to upload to MEGA using a simplified approach
+        # Since mega.py has dependency conflicts, we'll use an alternative method
         try:
-            if not self.email or not self.password:
-                logger.warning("MEGA credentials not available, storing locally only")
-                return self._store_local_backup(local_file_path, filename)
+            # For now, use local storage but with MEGA credentials validation
+            # In production, you would implement proper MEGA API calls here
+            logger.info(f"Attempting to append {filename} on MEGA account: {self.email}")
             
-            # Try to upload to MEGA using a simplified approach
-            # Since mega.py has dependency conflicts, we'll use an alternative method
-            try:
-                # For now, use local storage but with MEGA credentials validation
-                # In production, you would implement proper MEGA API calls here
-                logger.info(f"Attempting to upload {filename} to MEGA account: {self.email}")
-                
-                # Simulate MEGA upload with proper directory structure
-                mega_backup_dir = os.path.join(os.getcwd(), '.mega_cloud_storage')
-                os.makedirs(mega_backup_dir, exist_ok=True)
-                
-                backup_file = os.path.join(mega_backup_dir, filename)
-                
-                # Copy file to MEGA simulation directory
-                import shutil
-                shutil.copy2(local_file_path, backup_file)
-                
-                # Create a metadata file to track uploads
-                metadata_file = os.path.join(mega_backup_dir, 'upload_log.txt')
-                with open(metadata_file, 'a') as f:
-                    f.write(f"{datetime.now()}: Uploaded {filename} to MEGA account {self.email}\n")
-                
-                logger.info(f"Successfully uploaded {filename} to MEGA cloud storage")
-                return True
-                
-            except Exception as e:
-                logger.error(f"MEGA upload failed: {e}, falling back to local storage")
-                return self._store_local_backup(local_file_path, filename)
+            # Simulate MEGA upload with proper directory structure
+            mega_cloud_dir = os.path.join(os.getcwd(), '.mega_cloud_storage')
+            os.makedirs(mega_cloud_dir, exist_ok=True)
+            
+            cloud_file = os.path.join(mega_cloud_dir, filename)
+            if os.path.exists(cloud_file):
+                self._append_csv(rows, cloud_file)
+            else:
+                # Seed a new cloud file with the backup's history; later batches append their own rows
+                backup_file = os.path.join(os.getcwd(), '.mega_backup', filename)
+                with open(backup_file, 'rb') as src, open(cloud_file, 'wb') as dst:
+                    remaining = backup_size
+                    while remaining > 0:
+                        chunk = src.read(min(remaining, 1024 * 1024))
+                        if not chunk:
+                            break
+                        dst.write(chunk)
+                        remaining -= len(chunk)
+            
+            # Create a metadata file to track uploads
+            metadata_file = os.path.join(mega_cloud_dir, 'upload_log.txt')
+            with open(metadata_file, 'a') as f:
+                f.write(f"{datetime.now()}: Appended {len(rows)} rows to {filename} on MEGA account {self.email}\n")
+            
+            logger.info(f"Successfully appended {filename} to MEGA cloud storage")
+            return True
             
         except Exception as e:
-            logger.error(f"Failed to upload to MEGA: {e}")
+            logger.error(f"MEGA upload failed: {e}, rows remain in the local backup")
             return False
     
-    def _store_local_backup(self, local_file_path: str, filename: str) -> bool:
-        """Store file as local backup"""
+    def flush(self, timeout: float = None) -> bool:
+        """Wait for queued MEGA uploads; returns False if any failed or are still running"""
+        done, not_done = wait(self._pending_uploads, timeout)
+        self._pending_uploads = list(not_done)
+        return not not_done and all(future.result() for future in done)
+    
+    def _append_local_backup(self, rows: List[Dict[str, Any]], filename: str) -> bool:
+        """Append rows to the local backup file"""
         try:
             mega_backup_dir = os.path.join(os.getcwd(), '.mega_backup')
             os.makedirs(mega_backup_dir, exist_ok=True)
             
             backup_file = os.path.join(mega_backup_dir, filename)
+            self._append_csv(rows, backup_file)
             
-            import shutil
-            shutil.copy2(local_file_path, backup_file)
-            
-            logger.info(f"CSV file stored as local backup: {backup_file}")
+            logger.info(f"CSV rows appended to local backup: {backup_file}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to create local backup: {e}")
             return False
     
+    def _append_csv(self, rows: List[Dict[str, Any]], file_path: str):
+        """Append rows to a CSV, writing the header only when the file is new"""
+        fieldnames = row_fieldnames(rows)
+        header = read_csv_header(file_path)
+        if not header:
+            write_csv_rows(file_path, rows, fieldnames)
+            return
+        
+        new_columns = [column for column in fieldnames if column not in header]
+        if new_columns:
+            # New columns need a new header, so stream the file into a rewrite once
+            chunks = [*self._read_csv_chunks(file_path), pd.DataFrame(rows)]
+            self._rewrite_csv(file_path, header + new_columns, chunks)
+            return
+        
+        # append_csv_rows keeps appended rows aligned with the existing header
+        append_csv_rows(file_path, rows)
+    
+    def _read_csv_chunks(self, file_path: str, **kwargs):
+        """Stream a CSV as string-typed chunks so rewrites never hold the whole file"""
+        return pd.read_csv(file_path, dtype=str, keep_default_na=False, chunksize=CSV_CHUNK_SIZE, **kwargs)
+    
+    def _rewrite_csv(self, file_path: str, columns: list, chunks):
+        """Atomically replace a CSV with the given chunks, aligned to columns"""
+        fd, tmp_path = tempfile.mkstemp(suffix='.csv', dir=os.path.dirname(file_path))
+        try:
+            with os.fdopen(fd, 'w', newline='') as tmp_file:
+                pd.DataFrame(columns=columns).to_csv(tmp_file, index=False)
+                for chunk in chunks:
+                    chunk.reindex(columns=columns).to_csv(tmp_file, header=False, index=False)
+            os.replace(tmp_path, file_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+    
+    def _compact_csv(self, file_path: str) -> int:
+        """Keep the last row for each URL, streaming the file twice; returns rows removed"""
+        header = pd.read_csv(file_path, nrows=0).columns
+        if 'url' not in header:
+            return 0
+        
+        # First pass: the row number of each URL's latest copy
+        last_row = {}
+        total = 0
+        for chunk in self._read_csv_chunks(file_path, usecols=['url']):
+            last_row.update(zip(chunk['url'], range(total, total + len(chunk))))
+            total += len(chunk)
+        if len(last_row) == total:
+            return 0
+        
+        # Second pass: write only those rows
+        def kept_chunks():
+            start = 0
+            for chunk in self._read_csv_chunks(file_path):
+                positions = np.arange(start, start + len(chunk))
+                start += len(chunk)
+                yield chunk[chunk['url'].map(last_row).to_numpy() == positions]
+        
+        self._rewrite_csv(file_path, list(header), kept_chunks())
+        return total - len(last_row)
+    
+    def compact(self) -> int:
+        """Drop duplicate URLs from the stored CSV files and return how many rows were removed"""
+        removed = 0
+        for directory in ('.mega_cloud_storage', '.mega_backup'):
+            mega_dir = os.path.join(os.getcwd(), directory)
+            if not os.path.exists(mega_dir):
+                continue
+            
+            for filename in os.listdir(mega_dir):
+                if not filename.endswith('_news_data.csv'):
+                    continue
+                
+                file_path = os.path.join(mega_dir, filename)
+                try:
+                    file_removed = self._compact_csv(file_path)
+                    if file_removed:
+                        removed += file_removed
+                        logger.info(f"Compacted {filename}: removed {file_removed} duplicate rows")
+                        
+                except Exception as e:
+                    logger.error(f"Failed to compact {file_path}: {e}")
+        
+        return removed
+    
     def _download_csv_from_mega(self, filename: str) -> Optional[pd.DataFrame]:
         """Download CSV file from MEGA cloud storage"""
         try:
@@ -215,20 +352,7 @@ class MegaCSVStorageService:
     def get_filtered_data(self, source: str = None, search_query: str = None) -> List[Dict[str, Any]]:
         """Get filtered news data"""
         try:
-            all_data = self.get_all_news_data()
-            
-            if source:
-                all_data = [item for item in all_data if item.get('source', '').lower() == source.lower()]
-            
-            if search_query:
-                search_query = search_query.lower()
-                all_data = [
-                    item for item in all_data 
-                    if search_query in item.get('title', '').lower() or 
-                       search_query in item.get('content', '').lower()
-                ]
-            
-            return all_data
+            return news_records(filter_news_df(self.get_all_news_df(), source, search_query))
             
         except Exception as e:
             logger.error(f"Failed to filter data: {e}")
@@ -243,9 +367,7 @@ class MegaCSVStorageService:
             # Create temporary file
             temp_file = os.path.join(tempfile.gettempdir(), filename)
             
-            # Convert to DataFrame and save
-            df = pd.DataFrame(data)
-            df.to_csv(temp_file, index=False)
+            write_csv_rows(temp_file, data, row_fieldnames(data))
             
             return temp_file
             
@@ -2,18 +2,35 @@ import os
 import pandas as pd
 import logging
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import shutil
+from .csv_utils import (
+    NEWS_FIELDS, append_csv_rows, csv_row_count, read_csv_column, read_row_count,
+    row_fieldnames, unseen_rows, write_csv_rows, write_row_count
+)
+from .news_frames import add_search_columns, filter_news_df, news_records, sort_by_date
 
 logger = logging.getLogger(__name__)
 
+NEWS_SOURCES = ['moneycontrol', 'livemint', 'financialexpress']
+# Combined DataFrames keyed by the (path, mtime, size) of every source file
+_NEWS_DF_CACHE = OrderedDict()
+NEWS_DF_CACHE_SIZE = 4
+# Request threads share the cache
+_NEWS_DF_CACHE_LOCK = threading.Lock()
+
 class MegaManualUploadService:
     """Service that creates CSV files ready for manual upload to MEGA"""
     
     def __init__(self):
         self.upload_ready_dir = os.path.join(os.getcwd(), 'mega_upload_ready')
         self.backup_dir = os.path.join(os.getcwd(), '.data', 'csv_storage')
+        # source -> URLs already in its backup CSV
+        self._url_cache = {}
         self._ensure_directories()
     
     def _ensure_directories(self):
@@ -35,128 +52,169 @@ class MegaManualUploadService:
             if not data:
                 return 0
             
-            # Create DataFrame
-            df = pd.DataFrame(data)
-            
-            # Add scraped_at timestamp
-            df['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Create CSV filename with timestamp for uniqueness
+            # Paths for different storage locations
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"{source.lower()}_news_data.csv"
             filename_with_timestamp = f"{source.lower()}_news_{timestamp}.csv"
-            
-            # Paths for different storage locations
             upload_file = os.path.join(self.upload_ready_dir, filename)
             backup_file = os.path.join(self.backup_dir, filename)
             timestamped_file = os.path.join(self.upload_ready_dir, filename_with_timestamp)
             
-            # Load existing data for merging
-            existing_df = self._load_existing_data(backup_file)
+            # Drop articles already stored, including repeats within this batch
+            known_urls = self._get_url_cache(source, backup_file)
+            new_data = unseen_rows(data, known_urls)
             
-            if existing_df is not None:
-                # Merge with existing data, avoiding duplicates based on URL
-                combined_df = pd.concat([existing_df, df], ignore_index=True)
-                combined_df = combined_df.drop_duplicates(subset=['url'], keep='last')
-            else:
-                combined_df = df
+            if not new_data:
+                logger.info(f"No new {source} articles to prepare for MEGA upload")
+                return 0
             
-            # Save files in multiple locations
-            # 1. Main upload-ready file (for manual MEGA upload)
-            combined_df.to_csv(upload_file, index=False)
+            # Add scraped_at timestamp
+            scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = [{**item, 'scraped_at': scraped_at} for item in new_data]
             
-            # 2. Backup file (for app functionality)
-            combined_df.to_csv(backup_file, index=False)
+            # Save files in multiple locations
+            # 1. Backup file (for app functionality)
+            self._append_rows(backup_file, rows)
+            
+            # 2. Main upload-ready file (for manual MEGA upload). It is normally a hard
+            # link to the backup, so the append above already wrote it; re-link it if
+            # it was cleared out after an upload
+            if not os.path.exists(upload_file):
+                self._link_or_copy(backup_file, upload_file)
+                write_row_count(upload_file, csv_row_count(backup_file))
+            elif os.path.samefile(upload_file, backup_file):
+                write_row_count(upload_file, csv_row_count(backup_file))
+            else:
+                self._append_rows(upload_file, rows)
             
             # 3. Timestamped file (for version history)
-            df.to_csv(timestamped_file, index=False)
+            write_row_count(timestamped_file, write_csv_rows(timestamped_file, rows, NEWS_FIELDS))
+            
+            known_urls.update(row['url'] for row in rows)
             
             # Create upload instructions
             self._create_upload_instructions()
             
-            new_records = len(df)
-            total_records = len(combined_df)
+            new_records = len(rows)
             
             logger.info(f"Successfully prepared {new_records} new articles for MEGA upload")
-            logger.info(f"Total records: {total_records}")
             logger.info(f"Files ready for MEGA upload in: {self.upload_ready_dir}")
             
             return new_records
             
         except Exception as e:
+            # Files may hold part of this batch, so reload the URL set from disk next time
+            self._url_cache.pop(source, None)
             logger.error(f"Failed to prepare news data: {e}")
             raise
     
-    def _load_existing_data(self, file_path: str) -> Optional[pd.DataFrame]:
-        """Load existing CSV data if available"""
+    def _link_or_copy(self, src: str, dst: str):
+        """Hard-link dst to src so both names share one file, copying where links aren't possible"""
         try:
-            if os.path.exists(file_path):
-                return pd.read_csv(file_path)
-            return None
+            os.link(src, dst)
+        except OSError:
+            # e.g. the upload directory fell back to a temp dir on another device
+            shutil.copyfile(src, dst)
+    
+    def _append_rows(self, file_path: str, rows: List[Dict[str, Any]]):
+        """Append rows to a CSV and bump its row-count sidecar"""
+        previous = read_row_count(file_path) if os.path.exists(file_path) else 0
+        append_csv_rows(file_path, rows)
+        if previous is not None:
+            write_row_count(file_path, previous + len(rows))
+    
+    def _get_url_cache(self, source: str, backup_file: str) -> set:
+        """URLs already in the backup CSV, loaded once per source"""
+        if source not in self._url_cache:
+            self._url_cache[source] = self._load_existing_data(backup_file)
+        return self._url_cache[source]
+    
+    def _load_existing_data(self, file_path: str) -> set:
+        """Load the URLs of existing CSV data if available"""
+        try:
+            return read_csv_column(file_path, 'url')
         except Exception as e:
-            logger.warning(f"Could not load existing data from {file_path}: {e}")
-            return None
+            logger.warning(f"Could not load existing URLs from {file_path}: {e}")
+            return set()
     
-    def get_all_news_data(self) -> List[Dict[str, Any]]:
-        """Get all news data from CSV files"""
+    def _news_files_key(self) -> tuple:
+        """Identify the current version of every stored news file"""
+        key = []
+        for source in NEWS_SOURCES:
+            for directory in (self.upload_ready_dir, self.backup_dir):
+                path = os.path.join(directory, f"{source}_news_data.csv")
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                key.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(key)
+    
+    def get_all_news_df(self) -> pd.DataFrame:
+        """Combine all news data from CSV files into one DataFrame
+        
+        The result is cached until a source file changes, so treat it as read-only.
+        It also carries lowercased search columns; news_records() drops them.
+        """
+        cache_key = self._news_files_key()
+        with _NEWS_DF_CACHE_LOCK:
+            if cache_key in _NEWS_DF_CACHE:
+                _NEWS_DF_CACHE.move_to_end(cache_key)
+                return _NEWS_DF_CACHE[cache_key]
+        
         try:
-            all_data = []
-            sources = ['moneycontrol', 'livemint', 'financialexpress']
-            
-            for source in sources:
-                filename = f"{source}_news_data.csv"
-                
-                # Try upload directory first, then backup
-                file_paths = [
-                    os.path.join(self.upload_ready_dir, filename),
-                    os.path.join(self.backup_dir, filename)
-                ]
-                
-                for file_path in file_paths:
-                    if os.path.exists(file_path):
-                        try:
-                            df = pd.read_csv(file_path)
-                            if not df.empty:
-                                # Add source if not present
-                                if 'source' not in df.columns:
-                                    df['source'] = source.title()
-                                all_data.append(df)
-                                break  # Use first found file
-                        except Exception as e:
-                            logger.warning(f"Could not read {file_path}: {e}")
-            
-            if all_data:
-                combined_df = pd.concat(all_data, ignore_index=True)
-                # Sort by date (newest first)
-                if 'date' in combined_df.columns:
-                    combined_df['date'] = pd.to_datetime(combined_df['date'], errors='coerce')
-                    combined_df = combined_df.sort_values('date', ascending=False, na_position='last')
-                
-                return combined_df.to_dict('records')
-            
-            return []
-            
+            combined_df = self._load_news_df()
         except Exception as e:
             logger.error(f"Failed to retrieve news data: {e}")
-            return []
+            return pd.DataFrame()
+        
+        with _NEWS_DF_CACHE_LOCK:
+            _NEWS_DF_CACHE[cache_key] = combined_df
+            while len(_NEWS_DF_CACHE) > NEWS_DF_CACHE_SIZE:
+                _NEWS_DF_CACHE.popitem(last=False)
+        return combined_df
+    
+    def _read_source(self, source: str) -> Optional[pd.DataFrame]:
+        """Read one source's news CSV, trying the upload directory first, then backup"""
+        filename = f"{source}_news_data.csv"
+        file_paths = [
+            os.path.join(self.upload_ready_dir, filename),
+            os.path.join(self.backup_dir, filename)
+        ]
+        
+        for file_path in file_paths:
+            if os.path.exists(file_path):
+                try:
+                    df = pd.read_csv(file_path)
+                    if not df.empty:
+                        # Add source if not present
+                        if 'source' not in df.columns:
+                            df['source'] = source.title()
+                        return df  # Use first found file
+                except Exception as e:
+                    logger.warning(f"Could not read {file_path}: {e}")
+        return None
+    
+    def _load_news_df(self) -> pd.DataFrame:
+        """Read and combine the news CSV files"""
+        # The C parser releases the GIL, so threads overlap the three reads
+        with ThreadPoolExecutor(max_workers=len(NEWS_SOURCES)) as executor:
+            all_data = [df for df in executor.map(self._read_source, NEWS_SOURCES) if df is not None]
+        
+        if all_data:
+            combined_df = pd.concat(all_data, ignore_index=True)
+            return add_search_columns(sort_by_date(combined_df))
+        
+        return pd.DataFrame()
+    
+    def get_all_news_data(self) -> List[Dict[str, Any]]:
+        """Get all news data from CSV files"""
+        return news_records(self.get_all_news_df())
     
     def get_filtered_data(self, source: str = None, search_query: str = None) -> List[Dict[str, Any]]:
         """Get filtered news data"""
         try:
-            all_data = self.get_all_news_data()
-            
-            if source:
-                all_data = [item for item in all_data if item.get('source', '').lower() == source.lower()]
-            
-            if search_query:
-                search_query = search_query.lower()
-                all_data = [
-                    item for item in all_data 
-                    if search_query in item.get('title', '').lower() or 
-                       search_query in item.get('content', '').lower()
-                ]
-            
-            return all_data
+            return news_records(filter_news_df(self.get_all_news_df(), source, search_query))
             
         except Exception as e:
             logger.error(f"Failed to filter data: {e}")
@@ -171,9 +229,7 @@ class MegaManualUploadService:
             # Create file in upload directory for easy access
             export_file = os.path.join(self.upload_ready_dir, filename)
             
-            # Convert to DataFrame and save
-            df = pd.DataFrame(data)
-            df.to_csv(export_file, index=False)
+            write_csv_rows(export_file, data, row_fieldnames(data))
             
             return export_file
             
@@ -244,10 +300,9 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                             size = os.path.getsize(file_path)
                             total_size += size
                             
-                            # Get record count
+                            # Get record count from the sidecar kept by store_news_data
                             try:
-                                df = pd.read_csv(file_path)
-                                record_count = len(df)
+                                record_count = csv_row_count(file_path)
                             except:
                                 record_count = 0
                             
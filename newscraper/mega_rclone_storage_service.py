@@ -1,16 +1,46 @@
+import io
 import os
 import json
 import pandas as pd
 import logging
 import subprocess
 import tempfile
+import threading
 import time
 import random
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from .csv_utils import (
+    NEWS_FIELDS, append_csv_rows, read_csv_column, row_fieldnames, unseen_rows, write_csv_rows, write_csv_stream
+)
+from .news_frames import add_search_columns, filter_news_df, news_records, sort_by_date
+from .rclone_daemon import RcloneRCError, get_rclone_daemon
 
 logger = logging.getLogger(__name__)
 
+# Parsed MEGA CSVs keyed by (remote path, ModTime) so unchanged files are not re-downloaded
+_MEGA_CSV_CACHE = OrderedDict()
+MEGA_CSV_CACHE_SIZE = 16
+# Sources are downloaded on parallel threads that share the cache
+_MEGA_CSV_CACHE_LOCK = threading.Lock()
+# Folder listings keyed by remote path -> (monotonic fetch time, {name: ModTime})
+_REMOTE_LISTINGS = {}
+REMOTE_LISTING_TTL = 60
+# Seconds allowed for streamed rclone cat/rcat transfers
+RCLONE_DOWNLOAD_TIMEOUT = 60
+RCLONE_UPLOAD_TIMEOUT = 120
+# rclone exit codes for a missing directory or file
+RCLONE_NOT_FOUND_CODES = (3, 4)
+
+NEWS_SOURCES = ['moneycontrol', 'livemint', 'financialexpress']
+# Combined DataFrames keyed by the (remote path, ModTime) of every source file
+_NEWS_DF_CACHE = OrderedDict()
+NEWS_DF_CACHE_SIZE = 4
+# Request threads share the cache
+_NEWS_DF_CACHE_LOCK = threading.Lock()
+
 def simple_retry(max_attempts=3, delay_base=2):
     """Simple retry decorator without external dependencies"""
     def decorator(func):
@@ -35,9 +65,16 @@ class MegaRcloneStorageService:
         self.remote_name = 'mega'
         self.upload_folder = os.getenv('MEGA_UPLOAD_FOLDER', 'finscrap')
         self.config_file = os.path.join('.secrets', 'rclone', 'rclone.conf')
+        # filename -> URLs already in that MEGA CSV
+        self._url_sets = {}
         self._ensure_config_dir()
         self._ensure_rclone_config()
     
+    @property
+    def _rc(self):
+        """Shared `rclone rcd`, restarted if it has died; None means each operation runs its own rclone process"""
+        return get_rclone_daemon(self.config_file)
+    
     def _ensure_config_dir(self):
         """Ensure rclone config directory exists"""
         try:
@@ -145,38 +182,58 @@ pass = {self._obscure_password(password)}
             if not data:
                 return 0
             
-            # Create DataFrame
-            df = pd.DataFrame(data)
-            
             # Add scraped_at timestamp
-            df['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = [{**item, 'scraped_at': scraped_at} for item in data]
             
             # Create CSV filename
             filename = f"{source.lower()}_news_data.csv"
             
-            # Download existing data if available
-            existing_df = self._download_csv_from_mega(filename)
+            # Nothing to upload if every URL is already known to be in MEGA;
+            # the remote file only grows, so a stale set can't hide a new URL
+            known_urls = self._url_sets.get(filename)
+            if known_urls is not None and not unseen_rows(rows, known_urls):
+                logger.info(f"No new articles for {filename}")
+                return 0
             
-            if existing_df is not None:
-                # Merge with existing data, avoiding duplicates based on URL
-                combined_df = pd.concat([existing_df, df], ignore_index=True)
-                combined_df = combined_df.drop_duplicates(subset=['url'], keep='last')
-            else:
-                combined_df = df
+            merge_file = os.path.join(tempfile.gettempdir(), f"merge_{filename}")
+            try:
+                # Download existing data if available and rebuild its URL set, since
+                # another worker may have appended to it since it was last read
+                if not self._download_file_from_mega(filename, merge_file):
+                    known_urls = set()
+                    if os.path.exists(merge_file):
+                        os.remove(merge_file)
+                else:
+                    known_urls = read_csv_column(merge_file, 'url')
+                
+                # Keep only articles not already in MEGA, avoiding duplicates based on URL
+                new_rows = unseen_rows(rows, known_urls)
+                if not new_rows:
+                    self._url_sets[filename] = known_urls
+                    logger.info(f"No new articles for {filename}")
+                    return 0
+                
+                # Append the new rows and upload the merged CSV
+                append_csv_rows(merge_file, new_rows)
+                self._upload_file_to_mega(merge_file, filename)
+            finally:
+                if os.path.exists(merge_file):
+                    os.remove(merge_file)
             
-            # Upload the merged CSV
-            self._upload_csv_to_mega(combined_df, filename)
+            # Only record URLs once they are in MEGA so a retried call re-adds them
+            known_urls.update(row['url'] for row in new_rows)
+            self._url_sets[filename] = known_urls
             
             # Also upload a timestamped version for history
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             timestamped_filename = f"{source.lower()}_news_{timestamp}.csv"
-            self._upload_csv_to_mega(df, timestamped_filename)
+            self._upload_csv_to_mega(new_rows, timestamped_filename)
             
-            new_records = len(df)
-            total_records = len(combined_df)
+            new_records = len(new_rows)
             
             logger.info(f"Successfully uploaded {new_records} new articles to MEGA via rclone")
-            logger.info(f"Total records in {filename}: {total_records}")
+            logger.info(f"Total records in {filename}: {len(known_urls)}")
             
             return new_records
             
@@ -186,68 +243,227 @@ pass = {self._obscure_password(password)}
             self._fallback_to_local_storage(data, source)
             raise
     
+    def _download_file_from_mega(self, filename: str, local_path: str) -> bool:
+        """Copy a file from the MEGA upload folder to local_path; False if it is missing"""
+        rc = self._rc
+        if rc:
+            try:
+                rc.call(
+                    'operations/copyfile',
+                    srcFs=f"{self.remote_name}:{self.upload_folder}", srcRemote=filename,
+                    dstFs=os.path.dirname(os.path.abspath(local_path)), dstRemote=os.path.basename(local_path),
+                )
+                return True
+            except RcloneRCError as e:
+                # Anything but a missing file must not be mistaken for an empty corpus
+                if e.status != 404:
+                    raise
+                logger.info(f"No existing {filename} found in MEGA")
+                return False
+        
+        remote_path = f"{self.remote_name}:{self.upload_folder}/{filename}"
+        result = subprocess.run([
+            'rclone', 'copyto', remote_path, local_path,
+            '--config', self.config_file
+        ], capture_output=True, text=True, timeout=60)
+        
+        if result.returncode in RCLONE_NOT_FOUND_CODES:
+            logger.info(f"No existing {filename} found in MEGA")
+            return False
+        if result.returncode != 0:
+            raise Exception(f"Download of {filename} failed: {result.stderr.strip()}")
+        return True
+    
+    def _list_remote_files(self) -> List[Dict[str, Any]]:
+        """lsjson-style entries for the files in the MEGA upload folder"""
+        rc = self._rc
+        if rc:
+            return rc.call(
+                'operations/list', timeout=30,
+                fs=f"{self.remote_name}:", remote=self.upload_folder, opt={'filesOnly': True},
+            )['list']
+        
+        result = subprocess.run([
+            'rclone', 'lsjson', '--files-only', f"{self.remote_name}:{self.upload_folder}",
+            '--config', self.config_file
+        ], capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            raise Exception(result.stderr.strip())
+        return json.loads(result.stdout)
+    
+    def _remote_mtimes(self) -> Optional[Dict[str, str]]:
+        """Map file name -> ModTime for the upload folder from one cached listing"""
+        remote_path = f"{self.remote_name}:{self.upload_folder}"
+        listing = _REMOTE_LISTINGS.get(remote_path)
+        if listing and time.monotonic() - listing[0] < REMOTE_LISTING_TTL:
+            return listing[1]
+        
+        try:
+            mtimes = {entry['Name']: entry.get('ModTime') for entry in self._list_remote_files()}
+        except Exception as e:
+            logger.warning(f"Could not list {remote_path}: {e}")
+            return None
+        
+        _REMOTE_LISTINGS[remote_path] = (time.monotonic(), mtimes)
+        return mtimes
+    
     def _download_csv_from_mega(self, filename: str) -> Optional[pd.DataFrame]:
-        """Download existing CSV from MEGA if it exists"""
+        """Download existing CSV from MEGA if it exists, reusing the parsed copy while its ModTime is unchanged
+        
+        Returns None if the file is missing or empty; other download failures are raised.
+        """
+        remote_path = f"{self.remote_name}:{self.upload_folder}/{filename}"
+        mtimes = self._remote_mtimes()
+        if mtimes is not None and filename not in mtimes:
+            logger.info(f"No existing {filename} found in MEGA")
+            return None
+        
+        cache_key = (remote_path, mtimes.get(filename) if mtimes else None)
+        with _MEGA_CSV_CACHE_LOCK:
+            if cache_key[1] and cache_key in _MEGA_CSV_CACHE:
+                _MEGA_CSV_CACHE.move_to_end(cache_key)
+                return _MEGA_CSV_CACHE[cache_key]
+        
+        # Stream the file straight into the parser
+        df = self._read_csv_from_mega(filename)
+        if df is None:
+            return None
+        logger.info(f"Downloaded existing {filename} from MEGA ({len(df)} records)")
+        
+        if cache_key[1]:
+            with _MEGA_CSV_CACHE_LOCK:
+                _MEGA_CSV_CACHE[cache_key] = df
+                while len(_MEGA_CSV_CACHE) > MEGA_CSV_CACHE_SIZE:
+                    _MEGA_CSV_CACHE.popitem(last=False)
+        
+        return df
+    
+    def _invalidate_cached_csv(self, filename: str):
+        """Forget the folder listing and any parsed copy of filename after it changes"""
+        remote_path = f"{self.remote_name}:{self.upload_folder}/{filename}"
+        _REMOTE_LISTINGS.pop(f"{self.remote_name}:{self.upload_folder}", None)
+        with _MEGA_CSV_CACHE_LOCK:
+            for cache_key in [key for key in _MEGA_CSV_CACHE if key[0] == remote_path]:
+                del _MEGA_CSV_CACHE[cache_key]
+    
+    def _read_csv_from_mega(self, filename: str) -> Optional[pd.DataFrame]:
+        """Parse a CSV streamed from MEGA without a temp file; None if it is missing or empty"""
+        rc = self._rc
+        if rc:
+            try:
+                with rc.open(f"{self.remote_name}:{self.upload_folder}", filename) as resp:
+                    return pd.read_csv(resp.raw)
+            except RcloneRCError as e:
+                if e.status != 404:
+                    raise
+                logger.info(f"No existing {filename} found in MEGA")
+                return None
+            except pd.errors.EmptyDataError:
+                return None
+        
+        remote_path = f"{self.remote_name}:{self.upload_folder}/{filename}"
+        proc = subprocess.Popen([
+            'rclone', 'cat', remote_path,
+            '--config', self.config_file
+        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        timer = threading.Timer(RCLONE_DOWNLOAD_TIMEOUT, proc.kill)
+        timer.start()
         try:
-            # Create remote path
-            remote_path = f"{self.remote_name}:{self.upload_folder}/{filename}"
-            temp_file = os.path.join(tempfile.gettempdir(), f"download_{filename}")
+            df = pd.read_csv(proc.stdout)
+        except pd.errors.EmptyDataError:
+            df = None
+        except Exception:
+            proc.kill()
+            raise
+        finally:
+            proc.communicate()
+            timer.cancel()
+        
+        # A failed or killed download can leave a truncated but parseable CSV
+        if proc.returncode in RCLONE_NOT_FOUND_CODES:
+            logger.info(f"No existing {filename} found in MEGA")
+            return None
+        if proc.returncode != 0:
+            raise Exception(f"Download of {filename} failed with rclone exit code {proc.returncode}")
+        return df
+    
+    def _upload_csv_to_mega(self, rows: List[Dict[str, Any]], filename: str):
+        """Stream news rows as CSV to MEGA without a temp file"""
+        try:
+            rc = self._rc
+            if rc:
+                # History files only hold the new rows, so building the body in memory is cheap
+                buffer = io.StringIO()
+                write_csv_stream(buffer, rows, NEWS_FIELDS)
+                rc.upload(
+                    f"{self.remote_name}:{self.upload_folder}", '', filename,
+                    buffer.getvalue().encode('utf-8'), timeout=RCLONE_UPLOAD_TIMEOUT,
+                )
+                self._invalidate_cached_csv(filename)
+                logger.info(f"Successfully uploaded {filename} to MEGA")
+                return
             
-            # Try to download the file
-            result = subprocess.run([
-                'rclone', 'copyto', remote_path, temp_file,
+            remote_path = f"{self.remote_name}:{self.upload_folder}/{filename}"
+            proc = subprocess.Popen([
+                'rclone', 'rcat', remote_path,
                 '--config', self.config_file
-            ], capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                # Read the CSV file
-                df = pd.read_csv(temp_file)
-                logger.info(f"Downloaded existing {filename} from MEGA ({len(df)} records)")
-                
-                # Clean up temp file
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
-                
-                return df
+            ], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            try:
+                stream = io.TextIOWrapper(proc.stdin, encoding='utf-8', newline='')
+                write_csv_stream(stream, rows, NEWS_FIELDS)
+                # Leave closing stdin (the EOF rclone waits for) to communicate()
+                stream.flush()
+                stream.detach()
+            except BaseException:
+                # Kill rclone so a half-written CSV is never committed
+                proc.kill()
+                proc.wait()
+                raise
+            _, stderr = proc.communicate(timeout=RCLONE_UPLOAD_TIMEOUT)
+            
+            if proc.returncode == 0:
+                self._invalidate_cached_csv(filename)
+                logger.info(f"Successfully uploaded {filename} to MEGA")
             else:
-                logger.info(f"No existing {filename} found in MEGA (or download failed)")
-                return None
-                
+                error_msg = stderr.decode('utf-8', 'replace').strip()
+                logger.error(f"Failed to upload {filename}: {error_msg}")
+                raise Exception(f"Upload failed: {error_msg}")
+            
         except Exception as e:
-            logger.warning(f"Could not download existing {filename}: {e}")
-            return None
+            logger.error(f"Failed to upload {filename} to MEGA: {e}")
+            raise
     
-    def _upload_csv_to_mega(self, df: pd.DataFrame, filename: str):
-        """Upload CSV DataFrame to MEGA using rclone"""
+    def _upload_file_to_mega(self, local_path: str, filename: str):
+        """Upload a local file to the MEGA upload folder using rclone"""
         try:
-            # Create temporary CSV file
-            temp_file = os.path.join(tempfile.gettempdir(), filename)
-            df.to_csv(temp_file, index=False)
+            rc = self._rc
+            if rc:
+                rc.call(
+                    'operations/copyfile', timeout=RCLONE_UPLOAD_TIMEOUT,
+                    srcFs=os.path.dirname(os.path.abspath(local_path)), srcRemote=os.path.basename(local_path),
+                    dstFs=f"{self.remote_name}:{self.upload_folder}", dstRemote=filename,
+                )
+                self._invalidate_cached_csv(filename)
+                logger.info(f"Successfully uploaded {filename} to MEGA")
+                return
             
             # Create remote path
             remote_path = f"{self.remote_name}:{self.upload_folder}/{filename}"
             
             # Upload to MEGA
             result = subprocess.run([
-                'rclone', 'copyto', temp_file, remote_path,
+                'rclone', 'copyto', local_path, remote_path,
                 '--config', self.config_file
             ], capture_output=True, text=True, timeout=120)
             
             if result.returncode == 0:
+                self._invalidate_cached_csv(filename)
                 logger.info(f"Successfully uploaded {filename} to MEGA")
             else:
                 error_msg = result.stderr.strip()
                 logger.error(f"Failed to upload {filename}: {error_msg}")
                 raise Exception(f"Upload failed: {error_msg}")
             
-            # Clean up temp file
-            try:
-                os.remove(temp_file)
-            except:
-                pass
-            
         except Exception as e:
             logger.error(f"Failed to upload {filename} to MEGA: {e}")
             raise
@@ -264,59 +480,100 @@ pass = {self._obscure_password(password)}
         except Exception as e:
             logger.error(f"Fallback storage also failed: {e}")
     
-    def get_all_news_data(self) -> List[Dict[str, Any]]:
-        """Download and combine all news data from MEGA CSV files"""
+    def _news_files_key(self) -> Optional[tuple]:
+        """Identify the current version of every news CSV in MEGA, or None if the folder can't be listed"""
+        mtimes = self._remote_mtimes()
+        if mtimes is None:
+            return None
+        folder = f"{self.remote_name}:{self.upload_folder}"
+        return tuple(
+            (f"{folder}/{source}_news_data.csv", mtimes.get(f"{source}_news_data.csv"))
+            for source in NEWS_SOURCES
+        )
+    
+    def get_all_news_df(self) -> pd.DataFrame:
+        """Download and combine all news data from MEGA CSV files into one DataFrame
+        
+        The result is cached until a source file's ModTime changes, so treat it as read-only.
+        It also carries lowercased search columns; news_records() drops them.
+        """
+        cache_key = self._news_files_key()
+        if cache_key is not None:
+            with _NEWS_DF_CACHE_LOCK:
+                if cache_key in _NEWS_DF_CACHE:
+                    _NEWS_DF_CACHE.move_to_end(cache_key)
+                    return _NEWS_DF_CACHE[cache_key]
+        
         try:
-            all_data = []
-            sources = ['moneycontrol', 'livemint', 'financialexpress']
-            
-            for source in sources:
-                filename = f"{source}_news_data.csv"
-                df = self._download_csv_from_mega(filename)
-                if df is not None and not df.empty:
-                    # Add source if not present
-                    if 'source' not in df.columns:
-                        df['source'] = source.title()
-                    all_data.append(df)
-            
-            if all_data:
-                combined_df = pd.concat(all_data, ignore_index=True)
-                # Sort by date (newest first)
-                if 'date' in combined_df.columns:
-                    combined_df['date'] = pd.to_datetime(combined_df['date'], errors='coerce')
-                    combined_df = combined_df.sort_values('date', ascending=False, na_position='last')
-                
-                return combined_df.to_dict('records')
-            
-            return []
-            
+            combined_df, complete = self._load_news_df()
         except Exception as e:
             logger.error(f"Failed to retrieve news data from MEGA: {e}")
             # Fallback to local data
             try:
                 from .mega_manual_upload_service import MegaManualUploadService
                 fallback_service = MegaManualUploadService()
-                return fallback_service.get_all_news_data()
+                return fallback_service.get_all_news_df()
             except:
-                return []
+                return pd.DataFrame()
+        
+        # A source that failed to download is retried on the next call
+        if cache_key is not None and complete:
+            with _NEWS_DF_CACHE_LOCK:
+                _NEWS_DF_CACHE[cache_key] = combined_df
+                while len(_NEWS_DF_CACHE) > NEWS_DF_CACHE_SIZE:
+                    _NEWS_DF_CACHE.popitem(last=False)
+        return combined_df
+    
+    def _read_source(self, source: str) -> Optional[pd.DataFrame]:
+        """Download one source's news CSV; None if it is missing or empty"""
+        filename = f"{source}_news_data.csv"
+        df = self._download_csv_from_mega(filename)
+        if df is None or df.empty:
+            return None
+        # Add source if not present, without touching the cached DataFrame
+        if 'source' not in df.columns:
+            df = df.assign(source=source.title())
+        return df
+    
+    def _load_news_df(self) -> Tuple[pd.DataFrame, bool]:
+        """Download and combine the news CSV files
+        
+        Returns (DataFrame, complete); complete is False if any source failed to download.
+        Raises if every source failed, so the caller can fall back to local data.
+        """
+        # Downloads are network-bound, so fetch the sources side by side
+        with ThreadPoolExecutor(max_workers=len(NEWS_SOURCES)) as executor:
+            futures = [executor.submit(self._read_source, source) for source in NEWS_SOURCES]
+        
+        all_data = []
+        errors = []
+        for source, future in zip(NEWS_SOURCES, futures):
+            try:
+                df = future.result()
+            except Exception as e:
+                logger.warning(f"Could not download {source} news from MEGA: {e}")
+                errors.append(e)
+                continue
+            if df is not None:
+                all_data.append(df)
+        
+        if len(errors) == len(NEWS_SOURCES):
+            raise errors[0]
+        
+        if all_data:
+            combined_df = pd.concat(all_data, ignore_index=True)
+            return add_search_columns(sort_by_date(combined_df)), not errors
+        
+        return pd.DataFrame(), not errors
+    
+    def get_all_news_data(self) -> List[Dict[str, Any]]:
+        """Download and combine all news data from MEGA CSV files"""
+        return news_records(self.get_all_news_df())
     
     def get_filtered_data(self, source: str = None, search_query: str = None) -> List[Dict[str, Any]]:
         """Get filtered news data from MEGA"""
         try:
-            all_data = self.get_all_news_data()
-            
-            if source:
-                all_data = [item for item in all_data if item.get('source', '').lower() == source.lower()]
-            
-            if search_query:
-                search_query = search_query.lower()
-                all_data = [
-                    item for item in all_data 
-                    if search_query in item.get('title', '').lower() or 
-                       search_query in item.get('content', '').lower()
-                ]
-            
-            return all_data
+            return news_records(filter_news_df(self.get_all_news_df(), source, search_query))
             
         except Exception as e:
             logger.error(f"Failed to filter MEGA data: {e}")
@@ -331,9 +588,7 @@ pass = {self._obscure_password(password)}
             # Create temporary file
             temp_file = os.path.join(tempfile.gettempdir(), filename)
             
-            # Convert to DataFrame and save
-            df = pd.DataFrame(data)
-            df.to_csv(temp_file, index=False)
+            write_csv_rows(temp_file, data, row_fieldnames(data))
             
             return temp_file
             
@@ -348,35 +603,28 @@ pass = {self._obscure_password(password)}
             total_size = 0
             
             # List files in MEGA upload folder
-            remote_path = f"{self.remote_name}:{self.upload_folder}"
-            result = subprocess.run([
-                'rclone', 'lsjson', remote_path,
-                '--config', self.config_file
-            ], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
-                try:
-                    file_list = json.loads(result.stdout)
+            try:
+                file_list = self._list_remote_files()
+            except Exception as e:
+                logger.error(f"Failed to list MEGA folder: {e}")
+                file_list = []
+            
+            for file_info in file_list:
+                if file_info.get('Name', '').endswith('.csv'):
+                    size = file_info.get('Size', 0)
+                    total_size += size
+                    
+                    # Estimate record count (approximate)
+                    estimated_records = max(0, (size - 100) // 150)
                     
-                    for file_info in file_list:
-                        if file_info.get('Name', '').endswith('.csv'):
-                            size = file_info.get('Size', 0)
-                            total_size += size
-                            
-                            # Estimate record count (approximate)
-                            estimated_records = max(0, (size - 100) // 150)
-                            
-                            files.append({
-                                'filename': file_info.get('Name', 'unknown'),
-                                'size': size,
-                                'size_mb': round(size / (1024 * 1024), 2),
-                                'records': estimated_records,
-                                'location': 'MEGA Cloud Storage',
-                                'modified': file_info.get('ModTime', 'unknown')
-                            })
-                            
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse rclone output: {e}")
+                    files.append({
+                        'filename': file_info.get('Name', 'unknown'),
+                        'size': size,
+                        'size_mb': round(size / (1024 * 1024), 2),
+                        'records': estimated_records,
+                        'location': 'MEGA Cloud Storage',
+                        'modified': file_info.get('ModTime', 'unknown')
+                    })
             
             return {
                 'total_files': len(files),
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-15 09:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newscraper', '0002_youtubescrapingjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='scraped_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
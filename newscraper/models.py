@@ -29,7 +29,7 @@ class Article(models.Model):
     category = models.CharField(max_length=100)
     content = models.TextField()
     source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
-    scraped_at = models.DateTimeField(default=timezone.now)
+    scraped_at = models.DateTimeField(default=timezone.now, db_index=True)
     published_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
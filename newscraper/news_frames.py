@@ -0,0 +1,82 @@
+import functools
+import re
+import pandas as pd
+
+# Lowercased copies of the searchable columns, built once per cached DataFrame
+SEARCH_COLUMNS = {'source': '_source_lc', 'title': '_title_lc', 'content': '_content_lc'}
+
+
+def text_column(df, name):
+    """A column as strings, with missing columns and values read as ''"""
+    if name not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[name].fillna('').astype(str)
+
+
+def sort_by_date(df):
+    """Parse the stored Y-m-d dates and sort newest first, undated rows last"""
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'], format='ISO8601', errors='coerce')
+        df = df.sort_values('date', ascending=False, na_position='last')
+    return df
+
+
+def add_search_columns(df):
+    """Precompute lowercased text columns so each search skips re-lowercasing the corpus"""
+    if not df.empty:
+        for name, search_name in SEARCH_COLUMNS.items():
+            df[search_name] = text_column(df, name).str.lower()
+    return df
+
+
+def search_column(df, name):
+    """The lowercased form of a column, precomputed if available"""
+    search_name = SEARCH_COLUMNS[name]
+    if search_name in df.columns:
+        return df[search_name]
+    return text_column(df, name).str.lower()
+
+
+def news_records(df):
+    """Rows as dicts, without the internal search columns"""
+    return df.drop(columns=list(SEARCH_COLUMNS.values()), errors='ignore').to_dict('records')
+
+
+@functools.lru_cache(maxsize=64)
+def keyword_pattern(keywords):
+    """One compiled alternation for a set of lowercased keywords, so a cell is scanned once for all of them"""
+    # Longest first so overlapping keywords match the most specific term
+    return re.compile('|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)))
+
+
+def filter_news_df(df, source=None, search_query=None):
+    """Rows of a combined news DataFrame matching a source and a title/content search
+
+    search_query is a phrase, or a list of keywords of which any may match.
+    """
+    if df.empty:
+        return df
+
+    # Build one mask so rows are only converted to dicts once, by the caller
+    mask = pd.Series(True, index=df.index)
+
+    if source:
+        mask &= search_column(df, 'source') == source.lower()
+
+    if isinstance(search_query, str):
+        search_query = [search_query]
+    keywords = frozenset(keyword.lower() for keyword in search_query or () if keyword)
+    if len(keywords) == 1:
+        keyword, = keywords
+        mask &= (
+            search_column(df, 'title').str.contains(keyword, regex=False) |
+            search_column(df, 'content').str.contains(keyword, regex=False)
+        )
+    elif keywords:
+        pattern = keyword_pattern(keywords)
+        mask &= (
+            search_column(df, 'title').str.contains(pattern) |
+            search_column(df, 'content').str.contains(pattern)
+        )
+
+    return df.loc[mask]
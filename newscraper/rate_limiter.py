@@ -0,0 +1,33 @@
+import asyncio
+import random
+import time
+
+
+class RateLimiter:
+    """Token-bucket rate limiter shared by concurrent asyncio tasks"""
+    
+    def __init__(self, requests_per_second: float, burst: int = 1, jitter: float = 0.0):
+        self.rate = requests_per_second
+        self.capacity = burst
+        self.jitter = jitter
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request slot is available"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+        
+        # Random extra delay (outside the lock) so requests avoid a fixed cadence
+        if self.jitter:
+            await asyncio.sleep(random.uniform(0, self.jitter))
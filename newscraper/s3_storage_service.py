@@ -6,14 +6,30 @@ import tempfile
 import time
 import random
 import io
+import threading
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
 logger = logging.getLogger(__name__)
 
+# Large CSV files move as 8 MiB parts, four at a time, in both directions
+CSV_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4
+)
+
+# boto3 clients are thread-safe and slow to build, so each process shares
+# one per credentials/region; views create a service per request
+_S3_CLIENTS = {}
+_S3_CLIENTS_LOCK = threading.Lock()
+# (client, bucket) pairs already checked with head_bucket in this process
+_VERIFIED_BUCKETS = set()
+
 def simple_retry(max_attempts=3, delay_base=2):
     """Simple retry decorator without external dependencies"""
     def decorator(func):
@@ -43,13 +59,15 @@ class S3StorageService:
         if not self.bucket_name:
             raise ValueError("AWS_S3_BUCKET environment variable is required")
         
-        # Configure boto3 client with retries
+        # Configure boto3 client with retries; the pool covers concurrent multipart transfers
         self.config = Config(
             retries={
                 'max_attempts': 5,
                 'mode': 'standard'
             },
-            region_name=self.region
+            region_name=self.region,
+            max_pool_connections=20,
+            tcp_keepalive=True
         )
         
         self._s3_client = None
@@ -64,15 +82,21 @@ class S3StorageService:
             if not access_key or not secret_key:
                 raise NoCredentialsError()
             
-            self._s3_client = boto3.client(
-                's3',
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
-                config=self.config
-            )
-            
-            # Test connection
-            self._test_bucket_access()
+            client_key = (access_key, secret_key, self.region)
+            with _S3_CLIENTS_LOCK:
+                if client_key not in _S3_CLIENTS:
+                    _S3_CLIENTS[client_key] = boto3.client(
+                        's3',
+                        aws_access_key_id=access_key,
+                        aws_secret_access_key=secret_key,
+                        config=self.config
+                    )
+                self._s3_client = _S3_CLIENTS[client_key]
+            
+            # Test connection once per process
+            if (client_key, self.bucket_name) not in _VERIFIED_BUCKETS:
+                self._test_bucket_access()
+                _VERIFIED_BUCKETS.add((client_key, self.bucket_name))
             logger.info(f"S3 client initialized for bucket: {self.bucket_name}")
             
         except Exception as e:
@@ -107,13 +131,18 @@ class S3StorageService:
     def _download_csv_from_s3(self, key: str) -> Optional[pd.DataFrame]:
         """Download CSV file from S3 and return as DataFrame"""
         try:
-            response = self._s3_client.get_object(Bucket=self.bucket_name, Key=key)
-            csv_content = response['Body'].read().decode('utf-8')
-            df = pd.read_csv(io.StringIO(csv_content))
+            # Large files are fetched as concurrent byte-range GETs
+            csv_buffer = io.BytesIO()
+            self._s3_client.download_fileobj(
+                self.bucket_name, key, csv_buffer, Config=CSV_TRANSFER_CONFIG
+            )
+            csv_buffer.seek(0)
+            df = pd.read_csv(csv_buffer, encoding='utf-8')
             logger.info(f"Downloaded {key} from S3 ({len(df)} records)")
             return df
         except ClientError as e:
-            if e.response['Error']['Code'] == 'NoSuchKey':
+            # download_fileobj reports a missing key from its HEAD request as a bare 404
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
                 logger.info(f"No existing file found at {key}")
                 return None
             else:
@@ -147,6 +176,24 @@ class S3StorageService:
             logger.error(f"Failed to upload {key} to S3: {e}")
             raise
     
+    @simple_retry(max_attempts=3, delay_base=2)
+    def _upload_csv_file_to_s3(self, file_path: str, key: str):
+        """Upload a CSV file from disk to S3 without reading it into memory"""
+        try:
+            self._s3_client.upload_file(
+                file_path,
+                self.bucket_name,
+                key,
+                ExtraArgs={'ContentType': 'text/csv', 'ServerSideEncryption': 'AES256'},
+                Config=CSV_TRANSFER_CONFIG
+            )
+            
+            logger.info(f"Successfully uploaded {key} to S3")
+            
+        except Exception as e:
+            logger.error(f"Failed to upload {key} to S3: {e}")
+            raise
+    
     @simple_retry(max_attempts=3, delay_base=4)
     def store_news_data(self, data: List[Dict[str, Any]], source: str) -> int:
         """Store news data as CSV file in S3"""
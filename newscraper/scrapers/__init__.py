@@ -0,0 +1,6 @@
+from newscraper.scrapers.base import run_scrapers
+from newscraper.scrapers.financialexpress import FinancialExpressScraper
+from newscraper.scrapers.livemint import LiveMintScraper
+from newscraper.scrapers.moneycontrol import MoneyControlScraper
+
+__all__ = ['FinancialExpressScraper', 'LiveMintScraper', 'MoneyControlScraper', 'run_scrapers']
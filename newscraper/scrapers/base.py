@@ -0,0 +1,312 @@
+import asyncio
+import contextlib
+import functools
+import httpx
+import itertools
+import logging
+import lxml.html
+import random
+from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from django.utils import timezone
+from email.utils import parsedate_to_datetime
+from lxml.cssselect import CSSSelector
+from urllib.parse import urljoin
+from newscraper.article_cache import ArticleCache, DEFAULT_CACHE_TTL_HOURS
+from newscraper.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+FETCH_ATTEMPTS = 3
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+MAX_RETRY_DELAY = 60
+
+
+def create_client():
+    """Pooled HTTP/2 client; requests to one host multiplex over a connection"""
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS)
+
+
+def retry_delay(attempt, resp=None):
+    """Backoff before the next attempt, honouring a Retry-After header"""
+    retry_after = resp.headers.get('Retry-After') if resp is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - timezone.now()).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0), MAX_RETRY_DELAY)
+    return 2 ** attempt + random.random()
+
+
+@functools.lru_cache(maxsize=None)
+def compile_selector(selector):
+    """Translate a CSS selector to XPath once per worker process"""
+    return CSSSelector(selector)
+
+
+def parse_article_body(html, selector):
+    """Join the paragraphs of the article container; runs in a worker process"""
+    # html is the raw response bytes; libxml2 sniffs the encoding itself
+    if not html.strip():
+        return ""
+    doc = lxml.html.document_fromstring(html)
+
+    # Matches come back in document order, so the first is the outermost container
+    containers = compile_selector(selector)(doc)
+
+    if containers:
+        paragraphs = [p.text_content().strip() for p in containers[0].iter("p")]
+        return "\n\n".join(paragraphs)
+
+    return ""
+
+
+async def run_scrapers(scrapers, max_pages=3, cache_ttl=DEFAULT_CACHE_TTL_HOURS, client=None, parse_pool=None):
+    """Run several scrapers at once over one client, parse pool and article cache
+
+    A long-lived caller (scrape_worker) passes its own client and pool to
+    keep them warm between runs. Returns one result per scraper, in
+    order: its article list, or the exception that stopped it.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        article_cache = ArticleCache(cache_ttl)
+        stack.callback(article_cache.close)
+        if parse_pool is None:
+            parse_pool = stack.enter_context(ProcessPoolExecutor())
+        if client is None:
+            client = await stack.enter_async_context(create_client())
+
+        return await asyncio.gather(
+            *(
+                scraper.scrape_all(
+                    max_pages, client=client, parse_pool=parse_pool, article_cache=article_cache
+                )
+                for scraper in scrapers
+            ),
+            return_exceptions=True
+        )
+
+
+class BaseScraper:
+    """Async fetch, cache and parse pipeline shared by the news site scrapers"""
+
+    name = None
+    source = None
+    # Source name the articles are stored under in S3
+    storage_name = None
+    # Site root with a trailing slash; links are resolved against it
+    base_url = None
+    categories = []
+    # CSS selector group for the element holding the article paragraphs
+    content_selector = None
+    # Optional SoupStrainer so only the link markup of a listing page is built
+    link_strainer = None
+    # Per-request httpx options, so one client can serve every scraper
+    request_options = {'timeout': 20}
+    max_concurrent_requests = 10
+    requests_per_second = 5
+    # Upper bound in seconds of the random delay added to each request
+    rate_jitter = 0.0
+    keep_empty_content = False
+
+    def __init__(self, cache_ttl=DEFAULT_CACHE_TTL_HOURS, stdout=None):
+        self.cache_ttl = cache_ttl
+        self.stdout = stdout
+
+    def write(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def listing_url(self, category, page):
+        raise NotImplementedError
+
+    def extract_links(self, soup):
+        """Return (title, url) pairs for the articles on a listing page"""
+        raise NotImplementedError
+
+    def request_headers(self):
+        return {}
+
+    def article_url(self, href):
+        """Resolve a link against the site root; None for off-site links"""
+        url = urljoin(self.base_url, href)
+        return url if url.startswith(self.base_url) else None
+
+    def run(self, max_pages=3, categories=None):
+        """Synchronous entry point for management commands"""
+        return asyncio.run(self.scrape_all(max_pages, categories))
+
+    async def scrape_all(self, max_pages=3, categories=None, client=None, parse_pool=None, article_cache=None):
+        """Scrape every category over one pooled async client
+
+        run_scrapers() passes in a client, parse pool and cache shared by
+        every source; anything not passed in is created for this run.
+        """
+        categories = categories or self.categories
+        # Polite crawling: bounded concurrency and a request rate per host
+        self.semaphore = asyncio.BoundedSemaphore(self.max_concurrent_requests)
+        self.rate_limiter = RateLimiter(self.requests_per_second, jitter=self.rate_jitter)
+        # URLs already handled this run, shared across pages and categories
+        self.seen_urls = set()
+
+        async with contextlib.AsyncExitStack() as stack:
+            if article_cache is None:
+                article_cache = ArticleCache(self.cache_ttl)
+                stack.callback(article_cache.close)
+            if parse_pool is None:
+                # Article parsing is CPU-bound, so keep it off the event loop
+                parse_pool = stack.enter_context(ProcessPoolExecutor())
+            if client is None:
+                client = await stack.enter_async_context(create_client())
+            self.article_cache = article_cache
+            self.parse_pool = parse_pool
+
+            # Categories are independent, so scrape them all at once; the
+            # shared semaphore and rate limiter keep the host load bounded
+            self.write(f'Scraping {self.name} categories: {", ".join(categories)}')
+            results = await asyncio.gather(
+                *(self.scrape_category(client, category, max_pages) for category in categories)
+            )
+
+        for category, articles in zip(categories, results):
+            self.write(f'Scraped {len(articles)} articles from {category}')
+        return list(itertools.chain.from_iterable(results))
+
+    async def fetch(self, client, url, keep_body=False):
+        """GET a URL within the concurrency and rate limits, revalidating cached copies"""
+        validators, body = self.article_cache.get_validators(url)
+        headers = {**self.request_headers(), **validators}
+        for attempt in range(FETCH_ATTEMPTS):
+            last_attempt = attempt == FETCH_ATTEMPTS - 1
+            try:
+                async with self.semaphore:
+                    await self.rate_limiter.acquire()
+                    resp = await client.get(url, headers=headers, **self.request_options)
+            except TRANSIENT_ERRORS as e:
+                if last_attempt:
+                    raise
+                logger.warning(f"Retrying {url} after {type(e).__name__}: {e}")
+                await asyncio.sleep(retry_delay(attempt))
+                continue
+
+            if resp.status_code not in RETRY_STATUS_CODES or last_attempt:
+                break
+            logger.warning(f"Retrying {url} after HTTP {resp.status_code}")
+            # Back off outside the semaphore so other requests keep flowing
+            await asyncio.sleep(retry_delay(attempt, resp))
+
+        if resp.status_code == 304 and body is not None:
+            # Unchanged since the last run: replay the stored page
+            return httpx.Response(200, content=body, request=resp.request)
+        if resp.status_code == 200:
+            self.article_cache.put_validators(url, resp, keep_body)
+        return resp
+
+    async def scrape_category(self, client, category, max_pages):
+        # Listing pages are fetched concurrently; results are kept up to the
+        # first page that shows the listing has ended
+        pages = await asyncio.gather(
+            *(self.scrape_page(client, category, page) for page in range(1, max_pages + 1))
+        )
+
+        articles = []
+        for posts in pages:
+            if posts is None:
+                break
+            articles.extend(posts)
+
+        return articles
+
+    async def scrape_page(self, client, category, page):
+        """Scrape one listing page; None means the listing has ended"""
+        url = self.listing_url(category, page)
+
+        try:
+            resp = await self.fetch(client, url, keep_body=True)
+            if resp.status_code in RETRY_STATUS_CODES:
+                # Still failing after retries; later pages may be fine
+                logger.error(f"Giving up on page {page} for {category} after HTTP {resp.status_code}")
+                return []
+            if resp.status_code != 200:
+                logger.warning(f"Page {page} returned {resp.status_code}")
+                return None
+
+            posts = await self.extract_posts_from_page(client, resp.content)
+            if posts is None:
+                logger.info(f"No posts found on page {page}")
+            return posts
+
+        except Exception as e:
+            logger.error(f"Error fetching page {page} for {category}: {e}")
+            return []
+
+    def drop_seen(self, links):
+        """Filter out (title, url) pairs whose URL was already handled this run"""
+        new_links = []
+        for title, url in links:
+            if url not in self.seen_urls:
+                self.seen_urls.add(url)
+                new_links.append((title, url))
+        return new_links
+
+    async def extract_posts_from_page(self, client, html):
+        links = self.extract_links(BeautifulSoup(html, "lxml", parse_only=self.link_strainer))
+
+        # None tells the page loop the listing is exhausted
+        if not links:
+            return None
+
+        # Skip URLs this run has already handled, e.g. from an overlapping category
+        links = self.drop_seen(links)
+
+        # Reuse bodies cached by earlier runs and fetch the rest concurrently
+        contents = self.article_cache.get_many(url for _, url in links)
+        missing = [url for _, url in links if url not in contents]
+        fetched = await asyncio.gather(
+            *(self.extract_article_content(client, url) for url in missing)
+        )
+        contents.update(zip(missing, fetched))
+
+        # Drop stories already stored under a different URL, e.g. syndicated copies
+        duplicates = self.article_cache.claim_content((url, contents[url]) for _, url in links)
+        self.article_cache.put_many(zip(missing, fetched))
+
+        posts = []
+        scraped_date = timezone.now().strftime('%Y-%m-%d')
+        for title, url in links:
+            content = contents[url]
+            if url in duplicates:
+                continue
+            if content or self.keep_empty_content:
+                posts.append({
+                    "title": title,
+                    "url": url,
+                    "date": scraped_date,
+                    "content": content,
+                    "source": self.source
+                })
+
+        return posts
+
+    async def extract_article_content(self, client, url):
+        try:
+            resp = await self.fetch(client, url)
+            if resp.status_code == 304:
+                # Unchanged since it was cached, so skip downloading and parsing it
+                return self.article_cache.get_stale(url)
+            resp.raise_for_status()
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.parse_pool, parse_article_body, resp.content, self.content_selector
+            )
+        except Exception as e:
+            logger.error(f"Error extracting content from {url}: {e}")
+            return ""
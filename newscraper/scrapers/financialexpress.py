@@ -0,0 +1,30 @@
+from bs4 import SoupStrainer
+from newscraper.scrapers.base import BaseScraper
+
+
+class FinancialExpressScraper(BaseScraper):
+    name = 'Financial Express'
+    source = 'financialexpress'
+    storage_name = 'FinancialExpress'
+    base_url = 'https://www.financialexpress.com/'
+    categories = [
+        "business", "market", "industry", "economy", "personal-finance",
+        "opinion", "investing", "mutual-funds", "money", "auto", "technology"
+    ]
+    content_selector = "div.article-section, div.post-content, div.entry-content"
+    link_strainer = SoupStrainer("h2", class_="entry-title")
+
+    def listing_url(self, category, page):
+        if page > 1:
+            return f"{self.base_url}{category}/page/{page}/"
+        return f"{self.base_url}{category}/"
+
+    def extract_links(self, soup):
+        links = []
+
+        for link_tag in soup.select("h2.entry-title a"):
+            url = self.article_url(link_tag["href"])
+            if url:
+                links.append((link_tag.get_text(strip=True), url))
+
+        return links
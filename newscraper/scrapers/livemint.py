@@ -0,0 +1,48 @@
+import random
+from bs4 import SoupStrainer
+from newscraper.scrapers.base import BaseScraper
+
+# User agents for rotation
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+)
+
+
+class LiveMintScraper(BaseScraper):
+    name = 'LiveMint'
+    source = 'livemint'
+    storage_name = 'LiveMint'
+    base_url = 'https://www.livemint.com/'
+    categories = ["latest-news"]
+    content_selector = "div.story-content, div.contentSec, div#mainContent"
+    link_strainer = SoupStrainer("div", class_="headlineSec")
+    request_options = {'timeout': 30, 'follow_redirects': True}
+    # LiveMint is sensitive to crawl rate, so stay well below Financial Express
+    max_concurrent_requests = 5
+    requests_per_second = 2
+    rate_jitter = 1.0
+
+    def listing_url(self, category, page):
+        if page > 1:
+            return f"{self.base_url}{category}/page-{page}"
+        return f"{self.base_url}{category}"
+
+    def request_headers(self):
+        return {"User-Agent": random.choice(USER_AGENTS)}
+
+    def extract_links(self, soup):
+        links = []
+
+        for headline in soup.select("div.headlineSec"):
+            # Only the headline link; other anchors in the block are section or author links
+            link_tag = headline.select_one("a[href]")
+            if not link_tag:
+                continue
+
+            url = self.article_url(link_tag["href"])
+            if url:
+                links.append((link_tag.get_text(strip=True), url))
+
+        return links
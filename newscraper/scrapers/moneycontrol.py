@@ -0,0 +1,49 @@
+from bs4 import SoupStrainer
+from newscraper.scrapers.base import BaseScraper
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+class MoneyControlScraper(BaseScraper):
+    name = 'MoneyControl'
+    source = 'moneycontrol'
+    storage_name = 'MoneyControl'
+    base_url = 'https://www.moneycontrol.com/'
+    categories = ["business", "economy", "markets", "trends"]
+    # Try different containers for article content
+    content_selector = "div.article_page, div#contentdata"
+    link_strainer = SoupStrainer("li", class_="clearfix")
+    max_concurrent_requests = 5
+    requests_per_second = 3
+    keep_empty_content = True
+
+    def listing_url(self, category, page):
+        if page > 1:
+            return f"{self.base_url}news/{category}/page-{page}/"
+        return f"{self.base_url}news/{category}/"
+
+    def request_headers(self):
+        return REQUEST_HEADERS
+
+    def extract_links(self, soup):
+        links = []
+
+        for article in soup.select("li.clearfix"):
+            title_tag = article.find("h2")
+            link_tag = article.find("a")
+
+            if not title_tag or not link_tag:
+                continue
+
+            url = self.article_url(link_tag["href"])
+            if url:
+                links.append((title_tag.get_text(strip=True), url))
+
+        return links
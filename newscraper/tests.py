@@ -1,3 +1,188 @@
-from django.test import TestCase
+import csv
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from .csv_utils import (
+    count_csv_rows, csv_row_count, read_csv_column, read_row_count, row_count_path,
+    unseen_rows, write_row_count
+)
+from .news_frames import add_search_columns, filter_news_df, keyword_pattern
+
+
+class CsvScanTests(SimpleTestCase):
+    """The mmap record scan must agree with csv.reader on every input"""
+
+    CASES = {
+        'quoted_commas': 'title,url\n"a, b","u,1"\nc,u2\n',
+        'doubled_quotes': 'title,url\n"say ""hi""","u""1"\n',
+        'embedded_lf': 'title,url,content\n"x\ny",u1,"c\n\nd"\nz,u2,e\n',
+        'embedded_crlf': 'title,url,content\r\n"x\r\ny",u1,"c\r\nd"\r\nz,u2,e\r\n',
+        'blank_lines': 'title,url\na,u1\n\nb,u2\n\n',
+        'short_rows': 'title,url\nonly\na,u1\n',
+        'stray_quotes': 'title,url\na"b,u"1\nc,u2\n',
+        'no_trailing_newline': 'title,url\na,u1\nb,"u2"',
+        'header_only': 'title,url\n',
+        'empty': '',
+        'unicode': 'title,url\n"é ""ü""",ü1\n',
+    }
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp_dir.name, f'{name}.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    @staticmethod
+    def reference(path, column):
+        """URL set and row count as csv.reader sees them"""
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            rows = list(reader)
+        if not header or column not in header:
+            return set(), len(rows)
+        index = header.index(column)
+        return {row[index] for row in rows if len(row) > index}, len(rows)
+
+    def test_matches_csv_reader(self):
+        for name, text in self.CASES.items():
+            with self.subTest(name):
+                path = self.write(name, text)
+                urls, count = self.reference(path, 'url')
+                self.assertEqual(read_csv_column(path, 'url'), urls)
+                self.assertEqual(count_csv_rows(path), count)
+
+    def test_well_formed_files_skip_the_fallback(self):
+        with mock.patch('newscraper.csv_utils._read_csv_column_slow', side_effect=AssertionError('fell back')):
+            for name in ('quoted_commas', 'doubled_quotes', 'embedded_lf', 'embedded_crlf',
+                         'no_trailing_newline', 'unicode'):
+                with self.subTest(name):
+                    path = self.write(name, self.CASES[name])
+                    self.assertEqual(read_csv_column(path, 'url'), self.reference(path, 'url')[0])
+
+    def test_quoted_values_are_unescaped(self):
+        path = self.write('quoted', self.CASES['doubled_quotes'])
+        self.assertEqual(read_csv_column(path, 'url'), {'u"1'})
+        self.assertEqual(read_csv_column(path, 'title'), {'say "hi"'})
+
+    def test_missing_file_or_column(self):
+        self.assertEqual(read_csv_column(os.path.join(self.tmp_dir.name, 'missing.csv'), 'url'), set())
+        path = self.write('no_url', 'title,date\na,2024-01-01\n')
+        self.assertEqual(read_csv_column(path, 'url'), set())
+
+
+class RowCountSidecarTests(SimpleTestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, 'news.csv')
+        with open(self.path, 'w', newline='') as f:
+            f.write('title,url\na,u1\nb,u2\n')
+
+    def test_missing_sidecar(self):
+        self.assertIsNone(read_row_count(self.path))
+
+    def test_fresh_sidecar_is_trusted(self):
+        write_row_count(self.path, 42)
+        self.assertEqual(read_row_count(self.path), 42)
+        self.assertEqual(csv_row_count(self.path), 42)
+
+    def test_size_change_makes_sidecar_stale(self):
+        write_row_count(self.path, 2)
+        with open(self.path, 'a', newline='') as f:
+            f.write('c,u3\n')
+        self.assertIsNone(read_row_count(self.path))
+        # csv_row_count recounts and refreshes the sidecar
+        self.assertEqual(csv_row_count(self.path), 3)
+        self.assertEqual(read_row_count(self.path), 3)
+
+    def test_corrupt_sidecar_is_ignored(self):
+        with open(row_count_path(self.path), 'w') as f:
+            f.write('garbage')
+        self.assertIsNone(read_row_count(self.path))
+        self.assertEqual(csv_row_count(self.path), 2)
+
+
+class UnseenRowsTests(SimpleTestCase):
+
+    def test_drops_known_and_repeated_urls(self):
+        rows = [
+            {'url': 'u1', 'title': 'known'},
+            {'url': 'u2', 'title': 'first'},
+            {'url': 'u3', 'title': 'new'},
+            {'url': 'u2', 'title': 'repeat'},
+        ]
+        self.assertEqual(
+            [row['title'] for row in unseen_rows(rows, {'u1'})],
+            ['first', 'new']
+        )
+
+    def test_empty_input(self):
+        self.assertEqual(unseen_rows([], {'u1'}), [])
+
+
+class FilterNewsDfTests(SimpleTestCase):
+
+    def setUp(self):
+        self.df = add_search_columns(pd.DataFrame([
+            {'title': 'Sensex rallies', 'content': 'Markets up', 'source': 'LiveMint'},
+            {'title': 'RBI holds rates', 'content': 'Repo unchanged at 6.5%', 'source': 'MoneyControl'},
+            {'title': 'C++ jobs', 'content': np.nan, 'source': 'livemint'},
+        ]))
+
+    def titles(self, df):
+        return sorted(df['title'])
+
+    def test_source_is_case_insensitive(self):
+        self.assertEqual(
+            self.titles(filter_news_df(self.df, source='LIVEMINT')),
+            ['C++ jobs', 'Sensex rallies']
+        )
+
+    def test_phrase_matches_title_or_content_literally(self):
+        self.assertEqual(self.titles(filter_news_df(self.df, search_query='REPO')), ['RBI holds rates'])
+        self.assertEqual(self.titles(filter_news_df(self.df, search_query='c++')), ['C++ jobs'])
+        self.assertEqual(self.titles(filter_news_df(self.df, search_query='6.5%')), ['RBI holds rates'])
+
+    def test_keyword_list_matches_any(self):
+        self.assertEqual(
+            self.titles(filter_news_df(self.df, search_query=['sensex', 'rbi'])),
+            ['RBI holds rates', 'Sensex rallies']
+        )
+
+    def test_source_and_search_combine(self):
+        self.assertEqual(
+            self.titles(filter_news_df(self.df, source='livemint', search_query=['markets', 'rbi'])),
+            ['Sensex rallies']
+        )
+
+    def test_without_precomputed_columns(self):
+        raw = self.df[['title', 'content', 'source']]
+        self.assertEqual(self.titles(filter_news_df(raw, search_query='up')), ['Sensex rallies'])
+
+    def test_no_filters_and_empty_frame(self):
+        self.assertEqual(len(filter_news_df(self.df)), 3)
+        self.assertTrue(filter_news_df(pd.DataFrame(), source='livemint').empty)
+
+
+class KeywordPatternTests(SimpleTestCase):
+
+    def test_escapes_and_prefers_longest(self):
+        pattern = keyword_pattern(frozenset({'rate', 'rate cut', 'c++'}))
+        self.assertEqual(pattern.search('surprise rate cut').group(), 'rate cut')
+        self.assertEqual(pattern.search('c++ developers').group(), 'c++')
+        self.assertIsNone(pattern.search('cc developers'))
+
+    def test_compiled_once_per_keyword_set(self):
+        keywords = frozenset({'sensex', 'nifty'})
+        self.assertIs(keyword_pattern(keywords), keyword_pattern(frozenset({'nifty', 'sensex'})))
@@ -0,0 +1,61 @@
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSCRIPT_TTL_DAYS = 7
+# Keep IN (...) lookups under SQLite's host parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+class TranscriptCache:
+    """video_id-keyed store of transcript text so reruns skip YouTube for videos already seen"""
+
+    def __init__(self, ttl_days=DEFAULT_TRANSCRIPT_TTL_DAYS, cache_file=None):
+        self.ttl_seconds = int(ttl_days * 86400)
+        self.cache_file = cache_file or os.getenv(
+            'TRANSCRIPT_CACHE_FILE', str(settings.BASE_DIR / 'transcript_cache.sqlite3')
+        )
+        self.conn = sqlite3.connect(self.cache_file)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS transcripts (video_id TEXT PRIMARY KEY, text BLOB, fetched_at INTEGER)'
+        )
+
+    def get_many(self, video_ids):
+        """Return {video_id: transcript text} for videos cached within the TTL"""
+        video_ids = list(video_ids)
+        if self.ttl_seconds <= 0 or not video_ids:
+            return {}
+
+        cutoff = int(time.time()) - self.ttl_seconds
+        hits = {}
+        try:
+            for start in range(0, len(video_ids), LOOKUP_CHUNK_SIZE):
+                chunk = video_ids[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f'SELECT video_id, text FROM transcripts WHERE fetched_at > ? AND video_id IN ({placeholders})',
+                    [cutoff, *chunk]
+                )
+                hits.update((video_id, zlib.decompress(text).decode('utf-8')) for video_id, text in rows)
+        except (sqlite3.Error, zlib.error) as e:
+            logger.error(f"Error reading transcript cache: {e}")
+        return hits
+
+    def put(self, video_id, text):
+        """Store a transcript compressed; committed on close()"""
+        try:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?)',
+                (video_id, zlib.compress(text.encode('utf-8')), int(time.time()))
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Error writing transcript cache: {e}")
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()